@@ -22,13 +22,17 @@ References and data sources can be found in [1].
 
 #%% initialization
 
+import os
 import numpy as np, pandas as pd, scipy.stats as st, chaospy as cp, geopandas as gpd, matplotlib.pyplot as plt, seaborn as sns
+import shapely
 import matplotlib.colors as colors
 from colorpalette import Color
 from chaospy import distributions as shape
 from scipy import stats
 from matplotlib.mathtext import _mathtext as mathtext
 from matplotlib.patches import Rectangle
+from matplotlib.lines import TICKDOWN, TICKLEFT
+from pyproj import Transformer
 from math import pi
 
 # palette
@@ -55,6 +59,8 @@ color_map = colors.LinearSegmentedColormap.from_list('color_map', [b, g, y, o, r
 # MG: million gallon
 MG_2_m3 = 3785.4
 kWh_2_MJ = 3.6
+# kg/day to MMT/year, folded once instead of repeating the literal chain
+kg_d_2_MMT_yr = 365/10**9
 # convert N2O-N to N2O
 N_2_N2O = 44/28
 # 2023 Biosolids Annual Reports, EPA
@@ -119,23 +125,39 @@ crosswalk = {'B1':'*A1',
              'O5':'*B5',
              'O6':'*B6'}
 
+# Series view of the crosswalk so renames can use the C-level Series.map
+# instead of a per-row Python lambda
+crosswalk_ser = pd.Series(crosswalk)
+
+def read_excel_cached(file, sheet_name=0):
+    # parsing the input spreadsheets with openpyxl dominates startup, so keep
+    # a Parquet copy of each sheet next to the source file and read that on
+    # subsequent runs (delete the .parquet files after updating a spreadsheet)
+    cache = f'{os.path.splitext(file)[0]}_{sheet_name}.parquet'
+    if os.path.exists(cache):
+        return pd.read_parquet(cache)
+    data = pd.read_excel(file, sheet_name)
+    data.to_parquet(cache)
+    return data
+
 #%% load treatment train information for each WWTP
 
 WWTP_TT = pd.read_csv('tt_assignments_2022.csv')
 
-WWTP_info =  pd.read_csv('all_wwtps_data_070124.csv')
-WWTP_info = WWTP_info[['CWNS_ID','FACILITY_NAME','CITY',
-                       'STATE_CODE','LATITUDE','LONGITUDE']]
+# only these six columns are used, so skip parsing the rest of the file
+WWTP_info =  pd.read_csv('all_wwtps_data_070124.csv',
+                         usecols=['CWNS_ID','FACILITY_NAME','CITY',
+                                  'STATE_CODE','LATITUDE','LONGITUDE'])
 
 WWTP_info.rename(columns={'CWNS_ID':'CWNS_NUM',
                           'FACILITY_NAME':'FACILITY',
                           'STATE_CODE':'STATE'},
                  inplace=True)
 
-assert WWTP_TT.duplicated(subset='CWNS_NUM').sum() == 0
-assert WWTP_info.duplicated(subset='CWNS_NUM').sum() == 0
-
-WWTP_test = WWTP_TT.merge(WWTP_info, on='CWNS_NUM', how='inner')
+# validate runs the key-uniqueness checks inside the join itself;
+# the length assert still guards against rows dropped by the inner join
+WWTP_test = WWTP_TT.merge(WWTP_info, on='CWNS_NUM', how='inner',
+                          validate='one_to_one')
 
 assert len(WWTP_TT) == len(WWTP_test)
 
@@ -143,49 +165,62 @@ WWTP_TT = WWTP_test
 
 WWTP_TT['LAGOON_UNCATEGORIZED'] = WWTP_TT[['LAGOON_OTHER','STBL_POND']].max(axis=1)
 
-WWTP_TT['TT_IDENTIFIED'] = WWTP_TT[crosswalk.keys()].sum(axis=1)
+# the TT indicator columns are 0/1, so store them as uint8 once up front:
+# the repeated sums, any() reductions, and matrix products downstream then
+# read 1 byte per cell instead of 8
+WWTP_TT[list(crosswalk.keys())] = WWTP_TT[list(crosswalk.keys())].fillna(0).astype(np.uint8)
+
+WWTP_TT['TT_IDENTIFIED'] = WWTP_TT[list(crosswalk.keys())].to_numpy().sum(axis=1, dtype=np.int32)
 
 assert (WWTP_TT['TT_IDENTIFIED'] >= 1).sum() == len(WWTP_TT)
 
 non_continental = ['HI','VI','MP','GU','AK','AS','PR']
 
+# store the ~50 distinct state codes as a categorical so isin compares
+# integer category codes instead of hashing a Python string per row
+WWTP_TT['STATE'] = WWTP_TT['STATE'].astype('category')
 WWTP_TT = WWTP_TT[~WWTP_TT['STATE'].isin(non_continental)]
 
 #%% calculate LAGOON_UNCATEGORIZED composition
 
 # based on the flow weighted average of aerobic and (anaerobic+facultative)
 # lagoons of the rest of the WRRFs in the contiguous U.S.
-L_AE_flow = (WWTP_TT['LAGOON_AER']/WWTP_TT['TT_IDENTIFIED']*WWTP_TT['FLOW_2022_MGD_FINAL']).sum()
-L_AN_FA_flow = ((WWTP_TT['LAGOON_ANAER']+WWTP_TT['LAGOON_FAC'])/\
-                WWTP_TT['TT_IDENTIFIED']*WWTP_TT['FLOW_2022_MGD_FINAL']).sum()
+# one indicator.T @ weight product instead of per-lagoon Series chains
+lagoon_flow_per_TT = (WWTP_TT['FLOW_2022_MGD_FINAL']/WWTP_TT['TT_IDENTIFIED']).to_numpy()
+lagoon_flows = WWTP_TT[['LAGOON_AER','LAGOON_ANAER','LAGOON_FAC']].to_numpy().T @ lagoon_flow_per_TT
+
+L_AE_flow = lagoon_flows[0]
+L_AN_FA_flow = lagoon_flows[1] + lagoon_flows[2]
 
 L_AE_flow_ratio = L_AE_flow/(L_AE_flow+L_AN_FA_flow)
 L_AN_FA_flow_ratio = L_AN_FA_flow/(L_AE_flow+L_AN_FA_flow)
 
 #%% find TT codes used in WWTPs
 
-final_code = []
-
 # remove TTs that no WWTP is assined to
-for TT in list(crosswalk.keys()):
-    if WWTP_TT[TT].sum() != 0:
-        final_code.append(TT)
+# sum all indicator columns in one reduction instead of one scan per TT
+TT_totals = WWTP_TT[list(crosswalk.keys())].sum(axis=0)
+final_code = list(TT_totals.index[TT_totals != 0])
 
 # confirm each TT occur up to once for every WWTP
-assert WWTP_TT[final_code].max().max() == 1
-assert WWTP_TT[final_code].min().min() == 0
+# materialize the indicator slice once for both checks
+TT_indicator = WWTP_TT[final_code].to_numpy()
+assert TT_indicator.max() == 1
+assert TT_indicator.min() == 0
 
 #%% data preparation - TT electricity and NG
 
-energy_typical = pd.read_excel('Treatment Train Energy Spreadsheet (Typical).xlsx','All Trains (For Code)')
-energy_typical.fillna(0, inplace=True)
-energy_typical.rename(columns={'Unnamed: 0':'item'}, inplace=True)
-energy_typical.set_index('item', inplace=True)
-energy_typical = energy_typical.loc[['Total Electricity Usage [kWh/d] (including chemical production)',
-                                     'Total Electricity Usage [kWh/d] (excluding chemical production)',
-                                     'CHP Electricity Generation [kWh/d]',
-                                     'Total Natural Gas Usage [MJ/d] (including chemical production)',
-                                     'Total Natural Gas Usage [MJ/d] (excluding chemical production)']]
+# chain the clean-up steps so each frame is allocated once instead of being
+# rewritten by four inplace passes
+energy_typical = read_excel_cached('Treatment Train Energy Spreadsheet (Typical).xlsx','All Trains (For Code)')\
+    .fillna(0)\
+    .rename(columns={'Unnamed: 0':'item'})\
+    .set_index('item')\
+    .loc[['Total Electricity Usage [kWh/d] (including chemical production)',
+          'Total Electricity Usage [kWh/d] (excluding chemical production)',
+          'CHP Electricity Generation [kWh/d]',
+          'Total Natural Gas Usage [MJ/d] (including chemical production)',
+          'Total Natural Gas Usage [MJ/d] (excluding chemical production)']]
 
 energy_typical.loc['typical_elec_usage_chemical'] = energy_typical.loc['Total Electricity Usage [kWh/d] (including chemical production)'] -\
                                                     energy_typical.loc['Total Electricity Usage [kWh/d] (excluding chemical production)']
@@ -199,31 +234,31 @@ energy_typical.rename(index={'Total Electricity Usage [kWh/d] (including chemica
                              'CHP Electricity Generation [kWh/d]':'typical_elec_CHP',
                              'Total Natural Gas Usage [MJ/d] (including chemical production)':'typical_NG_usage'}, inplace=True)
 
-energy_best = pd.read_excel('Treatment Train Energy Spreadsheet (Best Practice).xlsx','All Trains (For Code)')
-energy_best.fillna(0, inplace=True)
-energy_best.rename(columns={'Unnamed: 0':'item'}, inplace=True)
-energy_best.set_index('item', inplace=True)
-energy_best.rename(index={'Total Electricity Usage [kWh/d]':'best_elec_usage',
-                          'CHP Electricity Generation [kWh/d]':'best_elec_CHP',
-                          'Total Natural Gas Usage [MJ/d]':'best_NG_usage'}, inplace=True)
+energy_best = read_excel_cached('Treatment Train Energy Spreadsheet (Best Practice).xlsx','All Trains (For Code)')\
+    .fillna(0)\
+    .rename(columns={'Unnamed: 0':'item'})\
+    .set_index('item')\
+    .rename(index={'Total Electricity Usage [kWh/d]':'best_elec_usage',
+                   'CHP Electricity Generation [kWh/d]':'best_elec_CHP',
+                   'Total Natural Gas Usage [MJ/d]':'best_NG_usage'})
 
-elec_best_WERF = pd.read_excel('Treatment Train Energy Spreadsheet (Best Practice).xlsx','WERF Trains (Electricity)')
+elec_best_WERF = read_excel_cached('Treatment Train Energy Spreadsheet (Best Practice).xlsx','WERF Trains (Electricity)')
 elec_best_WERF.set_index('All values in kWh/day', inplace=True)
 elec_best_WERF = elec_best_WERF.loc[['Hypchlorite Production','Acetic Acid Production','Lime Production']].sum()
 
-elec_best_Franken = pd.read_excel('Treatment Train Energy Spreadsheet (Best Practice).xlsx','Frankentrains (Electricity)')
+elec_best_Franken = read_excel_cached('Treatment Train Energy Spreadsheet (Best Practice).xlsx','Frankentrains (Electricity)')
 elec_best_Franken.set_index('All values in kWh/day', inplace=True)
 elec_best_Franken = elec_best_Franken.loc[['Hypochlorite Production','Acetic Acid Production','Lime Production']].sum()
 
 elec_best_chemical = pd.concat([elec_best_WERF, elec_best_Franken])
 
-NG_best_WERF = pd.read_excel('Treatment Train Energy Spreadsheet (Best Practice).xlsx','WERF Trains (Natural Gas)')
+NG_best_WERF = read_excel_cached('Treatment Train Energy Spreadsheet (Best Practice).xlsx','WERF Trains (Natural Gas)')
 NG_best_WERF.set_index('Unnamed: 0', inplace=True)
 NG_best_WERF = NG_best_WERF.loc[['Fuel Used for Chemical Production (Acetic Acid)',
                                  'Fuel Used for Chemical Production (Methanol)',
                                  'Fuel Used for Chemical Production (Lime)']].sum()
 
-NG_best_Franken = pd.read_excel('Treatment Train Energy Spreadsheet (Best Practice).xlsx','Frankentrains (Natural Gas)')
+NG_best_Franken = read_excel_cached('Treatment Train Energy Spreadsheet (Best Practice).xlsx','Frankentrains (Natural Gas)')
 NG_best_Franken.set_index('Unnamed: 0', inplace=True)
 NG_best_Franken = NG_best_Franken.loc[['Fuel Used for Chemical Production (Acetic Acid)',
                                        'Fuel Used for Chemical Production (Methanol)',
@@ -243,7 +278,7 @@ energy_uncertainty = pd.concat([energy_typical, energy_best])
 
 # electricity
 # balancing area
-balnc_area = pd.read_excel('WWTP Baseline Trains_8.xlsx','Balance_Area')
+balnc_area = read_excel_cached('WWTP Baseline Trains_8.xlsx','Balance_Area')
 
 upstream_elec_GHG = UEG = {# item          :   kg CO2e/MWh
                             'natural_gas'  :   24/1000*kWh_2_MJ*1000,
@@ -255,21 +290,26 @@ upstream_elec_GHG = UEG = {# item          :   kg CO2e/MWh
                             'geothermal'   :   1.35/1000*kWh_2_MJ*1000,
                             'hydro'        :   2.08/1000*kWh_2_MJ*1000}
 
+# kg CO2e/MWh for each generation column, applied as one matrix-vector
+# product instead of 14 column-by-scalar multiplies
+upstream_GHG_per_MWh = {'gas-ct_MWh'     :   UEG['natural_gas'],
+                        'gas-cc_MWh'     :   UEG['natural_gas'],
+                        'coal_MWh'       :   UEG['coal'],
+                        'nuclear_MWh'    :   UEG['nuclear'],
+                        'wind-ons_MWh'   :   UEG['wind'],
+                        'wind-ofs_MWh'   :   UEG['wind'],
+                        'csp_MWh'        :   UEG['solar'],
+                        'upv_MWh'        :   UEG['solar'],
+                        'distpv_MWh'     :   UEG['solar'],
+                        'o-g-s_MWh'      :   UEG['solar'],
+                        'biomass_MWh'    :   UEG['biomass'],
+                        'geothermal_MWh' :   UEG['geothermal'],
+                        'phs_MWh'        :   UEG['hydro'],
+                        'hydro_MWh'      :   UEG['hydro']}
+
 balnc_area['CO2_kg_total'] = balnc_area['co2_gen_mmt']*1000000000 +\
-                             balnc_area['gas-ct_MWh']*UEG['natural_gas'] +\
-                             balnc_area['gas-cc_MWh']*UEG['natural_gas'] +\
-                             balnc_area['coal_MWh']*UEG['coal'] +\
-                             balnc_area['nuclear_MWh']*UEG['nuclear'] +\
-                             balnc_area['wind-ons_MWh']*UEG['wind'] +\
-                             balnc_area['wind-ofs_MWh']*UEG['wind'] +\
-                             balnc_area['csp_MWh']*UEG['solar'] +\
-                             balnc_area['upv_MWh']*UEG['solar'] +\
-                             balnc_area['distpv_MWh']*UEG['solar'] +\
-                             balnc_area['o-g-s_MWh']*UEG['solar'] +\
-                             balnc_area['biomass_MWh']*UEG['biomass'] +\
-                             balnc_area['geothermal_MWh']*UEG['geothermal'] +\
-                             balnc_area['phs_MWh']*UEG['hydro'] +\
-                             balnc_area['hydro_MWh']*UEG['hydro']
+                             balnc_area[list(upstream_GHG_per_MWh.keys())] @\
+                                 np.array(list(upstream_GHG_per_MWh.values()))
 
 # balancing_area['generation'] in MWh
 balnc_area['kg_CO2_kWh'] = balnc_area['CO2_kg_total']/balnc_area['generation']/1000
@@ -280,19 +320,16 @@ balnc_area = balnc_area.loc[balnc_area['t'] == 2020]
 balnc_area['r'] = balnc_area['r'].str[1:].astype(int)
 balnc_area = balnc_area[['r','state','kg_CO2_kWh']]
 
-assert balnc_area.duplicated(subset='r').sum() == 0
-
-balnc_area_WWTP = pd.read_excel('WWTP_balancing_area.xlsx')
+balnc_area_WWTP = read_excel_cached('WWTP_balancing_area.xlsx')
 
 balnc_area_WWTP = balnc_area_WWTP.merge(balnc_area,
                                         how='inner',
                                         left_on='balancing_area',
-                                        right_on='r')
-
-assert WWTP_TT.duplicated(subset='CWNS_NUM').sum() == 0
-assert balnc_area_WWTP.duplicated(subset='CWNS_NUM').sum() == 0
+                                        right_on='r',
+                                        validate='many_to_one')
 
-WWTP_TT = WWTP_TT.merge(balnc_area_WWTP, how='left', on='CWNS_NUM')
+WWTP_TT = WWTP_TT.merge(balnc_area_WWTP, how='left', on='CWNS_NUM',
+                        validate='one_to_one')
 
 assert WWTP_TT['kg_CO2_kWh'].isna().sum() == 0
 
@@ -301,15 +338,14 @@ assert WWTP_TT['kg_CO2_kWh'].isna().sum() == 0
 # biosolids in tonne/year
 biosolids = pd.read_csv('biosolids_cwns_match_update_032524.csv')
 
-biosolids.fillna({'Amount of Biosolids Managed - Land Applied': 0}, inplace=True)
-biosolids.fillna({'Amount of Biosolids Managed - Surface Disposal': 0}, inplace=True)
-biosolids.fillna({'Amount of Biosolids Managed - Incinerated': 0}, inplace=True)
-biosolids.fillna({'Amount of Biosolids Managed - Other Management Practice': 0}, inplace=True)
+amount_cols = ['Amount of Biosolids Managed - Land Applied',
+               'Amount of Biosolids Managed - Surface Disposal',
+               'Amount of Biosolids Managed - Incinerated',
+               'Amount of Biosolids Managed - Other Management Practice']
 
-biosolids['total_biosolids'] = biosolids['Amount of Biosolids Managed - Land Applied'] +\
-                               biosolids['Amount of Biosolids Managed - Surface Disposal']+\
-                               biosolids['Amount of Biosolids Managed - Incinerated']+\
-                               biosolids['Amount of Biosolids Managed - Other Management Practice']
+biosolids[amount_cols] = biosolids[amount_cols].fillna(0)
+
+biosolids['total_biosolids'] = biosolids[amount_cols].sum(axis=1)
 
 biosolids = biosolids[['CWNS',
                        'total_biosolids',
@@ -319,18 +355,15 @@ biosolids = biosolids[['CWNS',
                        'Amount of Biosolids Managed - Incinerated',
                        'Amount of Biosolids Managed - Other Management Practice']]
 
-assert biosolids.duplicated(subset=['CWNS']).sum() == 0
-assert WWTP_TT.duplicated(subset=['CWNS_NUM']).sum() == 0
-
-WWTP_TT = WWTP_TT.merge(biosolids, how='left', left_on='CWNS_NUM', right_on='CWNS')
+WWTP_TT = WWTP_TT.merge(biosolids, how='left', left_on='CWNS_NUM', right_on='CWNS',
+                        validate='one_to_one')
 
 # calculate the ratio between biosolids amount and plant size
 WWTP_TT['biosolids_MGD_ratio'] = WWTP_TT['total_biosolids']/WWTP_TT['FLOW_2022_MGD_FINAL']
 
 # remove outliers from biosolids data (set 'Management Practice Type(s)' as np.nan)
 # use 10th and 90th
-quantile_10 = WWTP_TT['biosolids_MGD_ratio'].dropna().quantile(0.1)
-quantile_90 = WWTP_TT['biosolids_MGD_ratio'].dropna().quantile(0.9)
+quantile_10, quantile_90 = np.nanpercentile(WWTP_TT['biosolids_MGD_ratio'].to_numpy(), [10, 90])
 
 WWTP_TT.loc[((WWTP_TT['biosolids_MGD_ratio'] < quantile_10) |\
              (WWTP_TT['biosolids_MGD_ratio'] > quantile_90)),\
@@ -385,191 +418,79 @@ reduction_uncategorized = reduction_AeD*L_AE_flow_ratio + reduction_AD*L_AN_FA_f
 
 coefficient = WWTP_TT['FLOW_2022_MGD_FINAL']/WWTP_TT['TT_IDENTIFIED']
 
+# per-TT biosolids yield in kg/m3; the seven TT groups are disjoint and cover
+# all TT codes, so the seven group sums collapse to one matrix product
+biosolids_coef = pd.Series(0.0, index=list(crosswalk.keys()))
+biosolids_coef[TT_w_primary_AD] = sludge_w_primary*(1-TS_2_VS*reduction_AD)
+biosolids_coef[TT_w_primary_AeD] = sludge_w_primary*(1-TS_2_VS*reduction_AeD)
+biosolids_coef[TT_w_primary_none] = sludge_w_primary
+biosolids_coef[TT_wo_primary_AD] = sludge_wo_primary*(1-TS_2_VS*reduction_AD)
+biosolids_coef[TT_wo_primary_AeD] = sludge_wo_primary*(1-TS_2_VS*reduction_AeD)
+biosolids_coef[TT_wo_primary_L_u] = sludge_wo_primary*(1-TS_2_VS*reduction_uncategorized)
+biosolids_coef[TT_wo_primary_none] = sludge_wo_primary
+
 # calculate the theoretical biosolids amount in kg/year
-WWTP_TT['theoretical_biosolids'] = (WWTP_TT[TT_w_primary_AD].sum(axis=1)*\
-                                        coefficient*sludge_w_primary*\
-                                            (1-TS_2_VS*reduction_AD) +\
-                                    WWTP_TT[TT_w_primary_AeD].sum(axis=1)*\
-                                        coefficient*sludge_w_primary*\
-                                            (1-TS_2_VS*reduction_AeD) +\
-                                    WWTP_TT[TT_w_primary_none].sum(axis=1)*\
-                                        coefficient*sludge_w_primary +\
-                                    WWTP_TT[TT_wo_primary_AD].sum(axis=1)*\
-                                        coefficient*sludge_wo_primary*\
-                                            (1-TS_2_VS*reduction_AD) +\
-                                    WWTP_TT[TT_wo_primary_AeD].sum(axis=1)*\
-                                        coefficient*sludge_wo_primary*\
-                                            (1-TS_2_VS*reduction_AeD) +\
-                                    WWTP_TT[TT_wo_primary_L_u].sum(axis=1)*\
-                                        coefficient*sludge_wo_primary*\
-                                            (1-TS_2_VS*reduction_uncategorized) +\
-                                    WWTP_TT[TT_wo_primary_none].sum(axis=1)*\
-                                        coefficient*sludge_wo_primary)*MG_2_m3*365
+WWTP_TT['theoretical_biosolids'] = (WWTP_TT[list(crosswalk.keys())] @ biosolids_coef)*\
+    coefficient*MG_2_m3*365
 
 # step 3: for plants w/o biosolids data (WWTP_TT['Management Practice Type(s)'].isna())
 # step 3.1: calculate the biosolids amount based on disposal_2022.csv data
 
 disposal = pd.read_csv('disposal_2022.csv')
 
-assert disposal.duplicated(subset=['CWNS_NUM']).sum() == 0
-assert WWTP_TT.duplicated(subset=['CWNS_NUM']).sum() == 0
-
-WWTP_TT = WWTP_TT.merge(disposal, how='left', on='CWNS_NUM')
+WWTP_TT = WWTP_TT.merge(disposal, how='left', on='CWNS_NUM',
+                        validate='one_to_one')
 
 # LF = landfill, LA = land application, IN = incineration
-data_22_LF = (WWTP_TT['Management Practice Type(s)'].isna()) &\
-             (WWTP_TT['LANDFILL'].notna()) &\
-             (WWTP_TT['LAND_APP'].notna()) &\
-             (WWTP_TT['FBI_y'].notna()) &\
-             (WWTP_TT['MHI_y'].notna()) &\
-             (WWTP_TT['LANDFILL'] != 0) &\
-             (WWTP_TT['LAND_APP'] == 0) &\
-             (WWTP_TT['FBI_y'] == 0) &\
-             (WWTP_TT['MHI_y'] == 0)
-
-WWTP_TT.loc[data_22_LF, 'landfill'] = WWTP_TT['theoretical_biosolids']
-
-data_22_LA = (WWTP_TT['Management Practice Type(s)'].isna()) &\
-             (WWTP_TT['LANDFILL'].notna()) &\
-             (WWTP_TT['LAND_APP'].notna()) &\
-             (WWTP_TT['FBI_y'].notna()) &\
-             (WWTP_TT['MHI_y'].notna()) &\
-             (WWTP_TT['LANDFILL'] == 0) &\
-             (WWTP_TT['LAND_APP'] != 0) &\
-             (WWTP_TT['FBI_y'] == 0) &\
-             (WWTP_TT['MHI_y'] == 0)
-
-WWTP_TT.loc[data_22_LA, 'land_application'] = WWTP_TT['theoretical_biosolids']
-
-data_22_IN = (WWTP_TT['Management Practice Type(s)'].isna()) &\
-             (WWTP_TT['LANDFILL'].notna()) &\
-             (WWTP_TT['LAND_APP'].notna()) &\
-             (WWTP_TT['FBI_y'].notna()) &\
-             (WWTP_TT['MHI_y'].notna()) &\
-             (WWTP_TT['LANDFILL'] == 0) &\
-             (WWTP_TT['LAND_APP'] == 0) &\
-             ((WWTP_TT['FBI_y'] != 0) |\
-              (WWTP_TT['MHI_y'] != 0))
-
-WWTP_TT.loc[data_22_IN, 'incineration'] = WWTP_TT['theoretical_biosolids']
-
-data_22_LF_LA = (WWTP_TT['Management Practice Type(s)'].isna()) &\
-                (WWTP_TT['LANDFILL'].notna()) &\
-                (WWTP_TT['LAND_APP'].notna()) &\
-                (WWTP_TT['FBI_y'].notna()) &\
-                (WWTP_TT['MHI_y'].notna()) &\
-                (WWTP_TT['LANDFILL'] != 0) &\
-                (WWTP_TT['LAND_APP'] != 0) &\
-                (WWTP_TT['FBI_y'] == 0) &\
-                (WWTP_TT['MHI_y'] == 0)
-
-WWTP_TT.loc[data_22_LF_LA, 'landfill'] = WWTP_TT['theoretical_biosolids']*ratio_LF_LF_LA
-WWTP_TT.loc[data_22_LF_LA, 'land_application'] = WWTP_TT['theoretical_biosolids']*ratio_LA_LF_LA
-
-data_22_LF_IN = (WWTP_TT['Management Practice Type(s)'].isna()) &\
-                (WWTP_TT['LANDFILL'].notna()) &\
-                (WWTP_TT['LAND_APP'].notna()) &\
-                (WWTP_TT['FBI_y'].notna()) &\
-                (WWTP_TT['MHI_y'].notna()) &\
-                (WWTP_TT['LANDFILL'] != 0) &\
-                (WWTP_TT['LAND_APP'] == 0) &\
-                ((WWTP_TT['FBI_y'] != 0) |\
-                 (WWTP_TT['MHI_y'] != 0))
-
-WWTP_TT.loc[data_22_LF_IN, 'landfill'] = WWTP_TT['theoretical_biosolids']*ratio_LF_LF_IN
-WWTP_TT.loc[data_22_LF_IN, 'incineration'] = WWTP_TT['theoretical_biosolids']*ratio_IN_LF_IN
-
-data_22_LA_IN = (WWTP_TT['Management Practice Type(s)'].isna()) &\
-                (WWTP_TT['LANDFILL'].notna()) &\
-                (WWTP_TT['LAND_APP'].notna()) &\
-                (WWTP_TT['FBI_y'].notna()) &\
-                (WWTP_TT['MHI_y'].notna()) &\
-                (WWTP_TT['LANDFILL'] == 0) &\
-                (WWTP_TT['LAND_APP'] != 0) &\
-                ((WWTP_TT['FBI_y'] != 0) |\
-                 (WWTP_TT['MHI_y'] != 0))
-
-WWTP_TT.loc[data_22_LA_IN, 'land_application'] = WWTP_TT['theoretical_biosolids']*ratio_LA_LA_IN
-WWTP_TT.loc[data_22_LA_IN, 'incineration'] = WWTP_TT['theoretical_biosolids']*ratio_IN_LA_IN
-
-data_22_all = (WWTP_TT['Management Practice Type(s)'].isna()) &\
-              (WWTP_TT['LANDFILL'].notna()) &\
-              (WWTP_TT['LAND_APP'].notna()) &\
-              (WWTP_TT['FBI_y'].notna()) &\
-              (WWTP_TT['MHI_y'].notna()) &\
-              (WWTP_TT['LANDFILL'] != 0) &\
-              (WWTP_TT['LAND_APP'] != 0) &\
-              ((WWTP_TT['FBI_y'] != 0) |\
-               (WWTP_TT['MHI_y'] != 0))
-
-WWTP_TT.loc[data_22_all, 'landfill'] = WWTP_TT['theoretical_biosolids']*ratio_LF_all
-WWTP_TT.loc[data_22_all, 'land_application'] = WWTP_TT['theoretical_biosolids']*ratio_LA_all
-WWTP_TT.loc[data_22_all, 'incineration'] = WWTP_TT['theoretical_biosolids']*ratio_IN_all
+# classify each plant once with a bitmask (1 = LF, 2 = LA, 4 = IN) instead of
+# re-evaluating the same predicates for all seven disposal combinations
+data_22 = (WWTP_TT['Management Practice Type(s)'].isna()) &\
+          (WWTP_TT['LANDFILL'].notna()) &\
+          (WWTP_TT['LAND_APP'].notna()) &\
+          (WWTP_TT['FBI_y'].notna()) &\
+          (WWTP_TT['MHI_y'].notna())
+
+disposal_case = (WWTP_TT['LANDFILL'].ne(0).astype(np.uint8) +
+                 WWTP_TT['LAND_APP'].ne(0).astype(np.uint8)*2 +
+                 (WWTP_TT['FBI_y'].ne(0) | WWTP_TT['MHI_y'].ne(0)).astype(np.uint8)*4)
+
+# plants reporting no disposal at all keep np.nan, as before
+data_22 = data_22 & (disposal_case > 0)
+
+# (LF, LA, IN) fractions of the theoretical biosolids for each disposal case
+disposal_ratios = np.zeros((8, 3))
+disposal_ratios[1] = (1, 0, 0)
+disposal_ratios[2] = (0, 1, 0)
+disposal_ratios[3] = (ratio_LF_LF_LA, ratio_LA_LF_LA, 0)
+disposal_ratios[4] = (0, 0, 1)
+disposal_ratios[5] = (ratio_LF_LF_IN, 0, ratio_IN_LF_IN)
+disposal_ratios[6] = (0, ratio_LA_LA_IN, ratio_IN_LA_IN)
+disposal_ratios[7] = (ratio_LF_all, ratio_LA_all, ratio_IN_all)
+
+WWTP_TT.loc[data_22, ['landfill','land_application','incineration']] =\
+    disposal_ratios[disposal_case[data_22]]*\
+        WWTP_TT.loc[data_22, 'theoretical_biosolids'].to_numpy()[:, None]
 
 # step 3.2: calculate the biosolids amount for the rest of WWTPs based on TTs
 
-TT_IN = (WWTP_TT['Management Practice Type(s)'].isna()) &\
-        (WWTP_TT['LANDFILL'].isna()) &\
-        (WWTP_TT['LAND_APP'].isna()) &\
-        (WWTP_TT['FBI_y'].isna()) &\
-        (WWTP_TT['MHI_y'].isna()) &\
-        (WWTP_TT['TT_IDENTIFIED'] == 1) &\
-        ((WWTP_TT['B5'] == 1) |\
-         (WWTP_TT['B6'] == 1) |\
-         (WWTP_TT['C5'] == 1) |\
-         (WWTP_TT['C6'] == 1) |\
-         (WWTP_TT['D5'] == 1) |\
-         (WWTP_TT['D6'] == 1) |\
-         (WWTP_TT['G5'] == 1) |\
-         (WWTP_TT['G6'] == 1) |\
-         (WWTP_TT['I5'] == 1) |\
-         (WWTP_TT['I6'] == 1) |\
-         (WWTP_TT['O5'] == 1) |\
-         (WWTP_TT['O6'] == 1))
+# evaluate the shared predicates once instead of re-building the same
+# isna stack and the 12-way incineration OR chain for all three masks
+no_biosolids_data = WWTP_TT[['Management Practice Type(s)',
+                             'LANDFILL','LAND_APP','FBI_y','MHI_y']].isna().all(axis=1)
+has_IN_TT = WWTP_TT[TT_w_IN].to_numpy(dtype=bool).any(axis=1)
+
+TT_IN = no_biosolids_data & (WWTP_TT['TT_IDENTIFIED'] == 1) & has_IN_TT
 
 if TT_IN.sum() > 0:
     WWTP_TT.loc[TT_IN, 'incineration'] = WWTP_TT['theoretical_biosolids']
 
-TT_disposal = (WWTP_TT['Management Practice Type(s)'].isna()) &\
-              (WWTP_TT['LANDFILL'].isna()) &\
-              (WWTP_TT['LAND_APP'].isna()) &\
-              (WWTP_TT['FBI_y'].isna()) &\
-              (WWTP_TT['MHI_y'].isna()) &\
-              (WWTP_TT['B5'] == 0) &\
-              (WWTP_TT['B6'] == 0) &\
-              (WWTP_TT['C5'] == 0) &\
-              (WWTP_TT['C6'] == 0) &\
-              (WWTP_TT['D5'] == 0) &\
-              (WWTP_TT['D6'] == 0) &\
-              (WWTP_TT['G5'] == 0) &\
-              (WWTP_TT['G6'] == 0) &\
-              (WWTP_TT['I5'] == 0) &\
-              (WWTP_TT['I6'] == 0) &\
-              (WWTP_TT['O5'] == 0) &\
-              (WWTP_TT['O6'] == 0)
+TT_disposal = no_biosolids_data & ~has_IN_TT
 
 if TT_disposal.sum() > 0:
     WWTP_TT.loc[TT_disposal, 'landfill'] = WWTP_TT['theoretical_biosolids']*ratio_LF_LF_LA
     WWTP_TT.loc[TT_disposal, 'land_application'] = WWTP_TT['theoretical_biosolids']*ratio_LA_LF_LA
 
-TT_IN_disposal = (WWTP_TT['Management Practice Type(s)'].isna()) &\
-                 (WWTP_TT['LANDFILL'].isna()) &\
-                 (WWTP_TT['LAND_APP'].isna()) &\
-                 (WWTP_TT['FBI_y'].isna()) &\
-                 (WWTP_TT['MHI_y'].isna()) &\
-                 (WWTP_TT['TT_IDENTIFIED'] > 1) &\
-                 ((WWTP_TT['B5'] == 1) |\
-                  (WWTP_TT['B6'] == 1) |\
-                  (WWTP_TT['C5'] == 1) |\
-                  (WWTP_TT['C6'] == 1) |\
-                  (WWTP_TT['D5'] == 1) |\
-                  (WWTP_TT['D6'] == 1) |\
-                  (WWTP_TT['G5'] == 1) |\
-                  (WWTP_TT['G6'] == 1) |\
-                  (WWTP_TT['I5'] == 1) |\
-                  (WWTP_TT['I6'] == 1) |\
-                  (WWTP_TT['O5'] == 1) |\
-                  (WWTP_TT['O6'] == 1))
+TT_IN_disposal = no_biosolids_data & (WWTP_TT['TT_IDENTIFIED'] > 1) & has_IN_TT
 
 if TT_IN_disposal.sum() > 0:
     WWTP_TT.loc[TT_IN_disposal, 'incineration'] =\
@@ -586,14 +507,49 @@ if TT_IN_disposal.sum() > 0:
     WWTP_TT.loc[TT_IN_disposal, 'land_application'] = (WWTP_TT['theoretical_biosolids']-\
                                                        WWTP_TT['incineration'])*ratio_LA_LF_LA
 
-WWTP_TT.fillna({'landfill': 0}, inplace=True)
-WWTP_TT.fillna({'land_application': 0}, inplace=True)
-WWTP_TT.fillna({'incineration': 0}, inplace=True)
+WWTP_TT.fillna({'landfill': 0, 'land_application': 0, 'incineration': 0}, inplace=True)
 
 assert WWTP_TT[['landfill','land_application','incineration']].sum(axis=1).min() > 0
 
 #%% TT Monte Carlo
 
+# N2O EFs depend only on the treatment group (first letter of the TT code),
+# so build the lookup once instead of re-selecting the group per TT
+# organics removal
+N2O_EF_MC_organics = shape.Triangle(0.000035502958579881655, 0.0014563706563706566, 0.0062)
+# nitrification
+N2O_EF_MC_nitrification = shape.Triangle(0.0003008785529715762, 0.0021505376344086022, 0.04639999999999992)
+# BNR
+N2O_EF_MC_BNR = shape.Triangle(0.000044063593004769475, 0.0043858612, 0.03861727897938609)
+
+N2O_EF_MC_lookup = {}
+for group in ['B','C','D','O']:
+    N2O_EF_MC_lookup[group] = N2O_EF_MC_organics
+for group in ['E','F']:
+    N2O_EF_MC_lookup[group] = N2O_EF_MC_nitrification
+for group in ['G','H','I','N']:
+    N2O_EF_MC_lookup[group] = N2O_EF_MC_BNR
+
+# the biosolids inputs only ever take a handful of group-dependent values,
+# so build each candidate distribution once as well and pick inside the loop
+# sludge yield (kg/m3): with/without primary treatment
+sludge_yield_w_primary_MC = shape.Uniform(0.2636*0.9, 0.2636*1.1)
+sludge_yield_wo_primary_MC = shape.Uniform(0.131*0.9, 0.131*1.1)
+# VS reduction: AD (35-50%), AeD (40-55%)
+biosolids_reduction_AD_MC = shape.Uniform(0.35, 0.5)
+biosolids_reduction_AeD_MC = shape.Uniform(0.4, 0.55)
+biosolids_reduction_L_u_MC = shape.Uniform(0.4*L_AE_flow_ratio + 0.35*L_AN_FA_flow_ratio,
+                                           0.55*L_AE_flow_ratio + 0.5*L_AN_FA_flow_ratio)
+
+# 1st year CH4 emission from landfill using EPA's LandGEM model
+# baseline: 5.65 kg CH4 per tonne biosolids converted to per kg biosolids
+LF_CH4_EF_MC = shape.Uniform(5.65*0.9/1000, 5.65*1.1/1000)
+# N2O from land application
+# baseline: 0.049 kg N per kg biosolids land applied
+LA_solids_N_MC = shape.Triangle(0.0122, 0.049, 0.062)
+# baseline: 0.01 kg N2O-N/kg N
+LA_N2O_N_EF_MC = shape.Uniform(0.002, 0.018)
+
 for TT in final_code:
     if TT[0] != 'L':
         elec_lower = min(energy_uncertainty[TT]['best_elec_usage'] - energy_uncertainty[TT]['best_elec_CHP'],
@@ -675,15 +631,8 @@ for TT in final_code:
 
     TN_MC = shape.Uniform(23/1000, 69/1000)
     
-    # organics removal
-    if TT[0] in ['B','C','D','O']:
-        N2O_EF_MC = shape.Triangle(0.000035502958579881655, 0.0014563706563706566, 0.0062)
-    # nitrification
-    elif TT[0] in ['E','F']:
-        N2O_EF_MC = shape.Triangle(0.0003008785529715762, 0.0021505376344086022, 0.04639999999999992)
-    # BNR
-    elif TT[0] in ['G','H','I','N']:
-        N2O_EF_MC = shape.Triangle(0.000044063593004769475, 0.0043858612, 0.03861727897938609)
+    if TT[0] in N2O_EF_MC_lookup:
+        N2O_EF_MC = N2O_EF_MC_lookup[TT[0]]
     elif TT == 'LAGOON_AER':
         N2O_EF_MC = shape.Uniform(0.00016, 0.045)
     elif TT in ['LAGOON_ANAER','LAGOON_FAC']:
@@ -704,38 +653,28 @@ for TT in final_code:
               'F1','F1E','G1','G1E','G2','G3','G5',
               'G6','H1','H1E','N1','N1E','N2','O1',
               'O1E','O2','O3','O5','O6']:
-        sludge_yield_MC = shape.Uniform(0.2636*0.9, 0.2636*1.1)
+        sludge_yield_MC = sludge_yield_w_primary_MC
     # without primary treatment
-    else: 
-        sludge_yield_MC = shape.Uniform(0.131*0.9, 0.131*1.1)
-    
+    else:
+        sludge_yield_MC = sludge_yield_wo_primary_MC
+
     TS_2_VS_MC = shape.Uniform(0.4, 0.8)
-    
+
     # with AD
     if TT in ['B1','B1E','B4','C1','C1E','D1','D1E',
               'F1','F1E','G1','G1E','H1','H1E','I1',
               'I1E','LAGOON_ANAER','LAGOON_FAC','N1',
               'N1E','O1','O1E']:
-        biosolids_reduction_MC = shape.Uniform(0.35, 0.5)
+        biosolids_reduction_MC = biosolids_reduction_AD_MC
     # with AeD
     elif TT in ['B2','C2','D2','E2','E2P','G2','I2',
                 'LAGOON_AER','N2','O2']:
-        biosolids_reduction_MC = shape.Uniform(0.4, 0.55)
+        biosolids_reduction_MC = biosolids_reduction_AeD_MC
     elif TT == 'LAGOON_UNCATEGORIZED':
-        biosolids_reduction_MC = shape.Uniform(0.4*L_AE_flow_ratio + 0.35*L_AN_FA_flow_ratio,
-                                               0.55*L_AE_flow_ratio + 0.5*L_AN_FA_flow_ratio)
+        biosolids_reduction_MC = biosolids_reduction_L_u_MC
     else:
         biosolids_reduction_MC = 0
-    
-    # 1st year CH4 emission from landfill using EPA's LandGEM model
-    # baseline: 5.65 kg CH4 per tonne biosolids converted to per kg biosolids
-    LF_CH4_EF_MC = shape.Uniform(5.65*0.9/1000, 5.65*1.1/1000)
-    # N2O from land application
-    # baseline: 0.049 kg N per kg biosolids land applied
-    LA_solids_N_MC = shape.Triangle(0.0122, 0.049, 0.062)
-    # baseline: 0.01 kg N2O-N/kg N
-    LA_N2O_N_EF_MC = shape.Uniform(0.002, 0.018)
-    
+
     result_MC = pd.DataFrame()
     
     # TTs that are not lagoons and use incineration
@@ -1135,8 +1074,8 @@ solids_LF_95 = []
 solids_LA_95 = []
 
 total_MC = pd.DataFrame()
-spearman_p = pd.DataFrame()
-spearman_rho = pd.DataFrame()
+spearman_p_frames = []
+spearman_rho_frames = []
 
 TT_elec_uncertainty = pd.DataFrame()
 TT_elec_chemical_uncertainty = pd.DataFrame()
@@ -1181,11 +1120,10 @@ for TT in final_code:
     
     total_MC[TT] = breakdown_data_MC['total']
     
-    data_p = pd.read_excel(f'spearman_p/{TT}_p.xlsx')
-    spearman_p = pd.concat([spearman_p, data_p], axis=0)
-    
-    data_rho = pd.read_excel(f'spearman_rho/{TT}_rho.xlsx')
-    spearman_rho = pd.concat([spearman_rho, data_rho], axis=0)
+    # collect the per-TT frames and concatenate once after the loop,
+    # growing a frame by concat inside the loop recopies all earlier rows
+    spearman_p_frames.append(pd.read_excel(f'spearman_p/{TT}_p.xlsx'))
+    spearman_rho_frames.append(pd.read_excel(f'spearman_rho/{TT}_rho.xlsx'))
     
     TT_elec_uncertainty[TT] = breakdown_data_MC['elec_MC']
     
@@ -1229,71 +1167,85 @@ for TT in final_code:
             if NG_chemical_lower == NG_chemical_upper:
                 TT_NG_chemical_uncertainty[TT] = [NG_chemical_baseline]*10000
 
-m3_to_plot = pd.DataFrame()
-m3_to_plot['index'] = final_code
-m3_to_plot['CH4_5'] = CH4_5
-m3_to_plot['N2O_5'] = N2O_5
-m3_to_plot['NC_CO2_5'] = NC_CO2_5
-m3_to_plot['elec_5'] = elec_5
-m3_to_plot['NG_5'] = NG_5
-m3_to_plot['NG_combustion_5'] = NG_combustion_5
-m3_to_plot['NG_upstream_5'] = NG_upstream_5
-m3_to_plot['solids_5'] = solids_5
-m3_to_plot['solids_LF_5'] = solids_LF_5
-m3_to_plot['solids_LA_5'] = solids_LA_5
-m3_to_plot['CH4_50'] = CH4_50
-m3_to_plot['N2O_50'] = N2O_50
-m3_to_plot['NC_CO2_50'] = NC_CO2_50
-m3_to_plot['elec_50'] = elec_50
-m3_to_plot['NG_50'] = NG_50
-m3_to_plot['NG_combustion_50'] = NG_combustion_50
-m3_to_plot['NG_upstream_50'] = NG_upstream_50
-m3_to_plot['solids_50'] = solids_50
-m3_to_plot['solids_LF_50'] = solids_LF_50
-m3_to_plot['solids_LA_50'] = solids_LA_50
-m3_to_plot['CH4_95'] = CH4_95
-m3_to_plot['N2O_95'] = N2O_95
-m3_to_plot['NC_CO2_95'] = NC_CO2_95
-m3_to_plot['elec_95'] = elec_95
-m3_to_plot['NG_95'] = NG_95
-m3_to_plot['NG_combustion_95'] = NG_combustion_95
-m3_to_plot['NG_upstream_95'] = NG_upstream_95
-m3_to_plot['solids_95'] = solids_95
-m3_to_plot['solids_LF_95'] = solids_LF_95
-m3_to_plot['solids_LA_95'] = solids_LA_95
-m3_to_plot.set_index('index', inplace=True)
+spearman_p = pd.concat(spearman_p_frames, axis=0)
+spearman_rho = pd.concat(spearman_rho_frames, axis=0)
+
+# build the frame in a single constructor call instead of 30 sequential
+# column inserts that each rebuild the internal block layout
+m3_to_plot = pd.DataFrame({'CH4_5': CH4_5,
+                           'N2O_5': N2O_5,
+                           'NC_CO2_5': NC_CO2_5,
+                           'elec_5': elec_5,
+                           'NG_5': NG_5,
+                           'NG_combustion_5': NG_combustion_5,
+                           'NG_upstream_5': NG_upstream_5,
+                           'solids_5': solids_5,
+                           'solids_LF_5': solids_LF_5,
+                           'solids_LA_5': solids_LA_5,
+                           'CH4_50': CH4_50,
+                           'N2O_50': N2O_50,
+                           'NC_CO2_50': NC_CO2_50,
+                           'elec_50': elec_50,
+                           'NG_50': NG_50,
+                           'NG_combustion_50': NG_combustion_50,
+                           'NG_upstream_50': NG_upstream_50,
+                           'solids_50': solids_50,
+                           'solids_LF_50': solids_LF_50,
+                           'solids_LA_50': solids_LA_50,
+                           'CH4_95': CH4_95,
+                           'N2O_95': N2O_95,
+                           'NC_CO2_95': NC_CO2_95,
+                           'elec_95': elec_95,
+                           'NG_95': NG_95,
+                           'NG_combustion_95': NG_combustion_95,
+                           'NG_upstream_95': NG_upstream_95,
+                           'solids_95': solids_95,
+                           'solids_LF_95': solids_LF_95,
+                           'solids_LA_95': solids_LA_95},
+                          index=pd.Index(final_code, name='index'))
 
 WWTP_EF = m3_to_plot.copy()
 
 data_order = [i for i in m3_to_plot.index]
-updated_label_order = [crosswalk[i] for i in data_order]
+updated_label_order = list(crosswalk_ser[data_order])
 m3_to_plot.reset_index(inplace=True)
 m3_to_plot['new_TT'] = updated_label_order
 m3_to_plot.set_index('new_TT', inplace=True)
 m3_to_plot.drop('index', axis=1, inplace=True)
 
 # distribute the flow rate to TTs for each WWTP
-WWTP_TT_all = WWTP_TT.loc[:, final_code]
-WWTP_TT_all = WWTP_TT_all.div(WWTP_TT['TT_IDENTIFIED'], axis=0)
-WWTP_TT_all = WWTP_TT_all.mul(WWTP_TT['FLOW_2022_MGD_FINAL'], axis=0)
-
+# slice the indicator columns once and reuse for both the flow split and the
+# facility counts
+WWTP_TT_final = WWTP_TT[final_code]
+
+# one broadcast multiply on the underlying array instead of chained
+# div/mul calls that each allocate a full (N_WWTP, N_TT) frame
+flow_per_TT = (WWTP_TT['FLOW_2022_MGD_FINAL']/WWTP_TT['TT_IDENTIFIED']).to_numpy()
+WWTP_TT_all = pd.DataFrame(WWTP_TT_final.to_numpy()*flow_per_TT[:, None],
+                           index=WWTP_TT_final.index, columns=final_code)
+
+# the column sums already come out in data_order (both follow final_code),
+# so relabelling the axis is enough — no hash-based .loc reindex needed
 TT_flow = WWTP_TT_all.sum(axis=0)
-TT_flow = TT_flow.loc[data_order]
+assert (TT_flow.index != np.array(data_order)).sum() == 0
 TT_flow = TT_flow.set_axis(updated_label_order, axis=0)
 
-TT_num = WWTP_TT[final_code].sum(axis=0)
-TT_num = TT_num.loc[data_order]
+TT_num = WWTP_TT_final.sum(axis=0)
 TT_num = TT_num.set_axis(updated_label_order, axis=0)
 
 total_MC.rename(columns=crosswalk, inplace=True)
 
 # combine TTs with the only difference being the primary treatment since the difference between their median total per volume emissions are less than 5%
+total_MC_median = total_MC.median()
 for TT in ['A1','A1e','A3','A4','A5','A6','E3']:
-    assert (total_MC.median()['*'+TT] - total_MC.median()[TT])/total_MC.median()[TT] < 0.05
+    assert (total_MC_median['*'+TT] - total_MC_median[TT])/total_MC_median[TT] < 0.05
 
 for TT in ['A1','A1e','A3','A4','A5','A6','E3']:
-    total_MC['[*]'+TT] = (TT_flow[TT]*total_MC.sort_values(by=TT)[TT] +\
-                          TT_flow['*'+TT]*total_MC.sort_values(by=TT)['*'+TT])/(TT_flow[TT] + TT_flow['*'+TT])
+    # sort the two columns of interest once instead of re-sorting the whole
+    # frame for each of them
+    sorted_pair = total_MC[[TT, '*'+TT]].sort_values(by=TT)
+    total_MC['[*]'+TT] = (TT_flow[TT]*sorted_pair[TT] +\
+                          TT_flow['*'+TT]*sorted_pair['*'+TT])/(TT_flow[TT] + TT_flow['*'+TT])
     
     m3_to_plot.loc['[*]'+TT] = (TT_flow[TT]*m3_to_plot.loc[TT] +\
                                 TT_flow['*'+TT]*m3_to_plot.loc['*'+TT])/(TT_flow[TT] + TT_flow['*'+TT])
@@ -1334,19 +1286,23 @@ TT_characteristics.loc[TT_characteristics.index.str.contains('e', case=True), 'C
 
 TT_characteristics_reversed = TT_characteristics[::-1]
 
-fig, ax = plt.subplots(figsize=(32, 5))
+# shared figure style, set once here instead of before every figure: each
+# rcParams write goes through matplotlib's validator, and the values never
+# change between figures
+plt.rcParams.update({'axes.linewidth': 1.5,
+                     'hatch.linewidth': 1.5,
+                     'xtick.labelsize': 25,
+                     'ytick.labelsize': 25,
+                     'font.sans-serif': 'Arial',
+                     'pdf.fonttype': 42,
+                     'ps.fonttype': 42,
+                     'mathtext.fontset':'custom',
+                     'mathtext.default':'regular',
+                     'mathtext.bf':'Arial: bold'})
 
-plt.rcParams['axes.linewidth'] = 1.5
-plt.rcParams['hatch.linewidth'] = 1.5
-plt.rcParams['xtick.labelsize'] = 25
-plt.rcParams['ytick.labelsize'] = 25
-plt.rcParams['font.sans-serif'] = 'Arial'
-plt.rcParams['pdf.fonttype'] = 42
-plt.rcParams['ps.fonttype'] = 42
+mathtext.FontConstantsBase.sup1 = 0.35
 
-plt.rcParams.update({'mathtext.fontset':'custom'})
-plt.rcParams.update({'mathtext.default':'regular'})
-plt.rcParams.update({'mathtext.bf':'Arial: bold'})
+fig, ax = plt.subplots(figsize=(32, 5))
 
 ax = plt.gca()
 ax.set_xlim([0.15, len(label_order)+0.85])
@@ -1383,18 +1339,6 @@ for i in range(len(TT_characteristics_reversed.index)):
 
 fig, ax = plt.subplots(figsize=(32, 7))
 
-plt.rcParams['axes.linewidth'] = 1.5
-plt.rcParams['hatch.linewidth'] = 1.5
-plt.rcParams['xtick.labelsize'] = 25
-plt.rcParams['ytick.labelsize'] = 25
-plt.rcParams['font.sans-serif'] = 'Arial'
-plt.rcParams['pdf.fonttype'] = 42
-plt.rcParams['ps.fonttype'] = 42
-
-plt.rcParams.update({'mathtext.fontset':'custom'})
-plt.rcParams.update({'mathtext.default':'regular'})
-plt.rcParams.update({'mathtext.bf':'Arial: bold'})
-
 ax = plt.gca()
 ax.set_xlim([0.15, len(label_order)+0.85])
 ax.set_ylim([0, 3])
@@ -1430,8 +1374,6 @@ ax.set_ylabel('$\mathbf{Per\ volume\ GHG}$\n[kg ${CO_2}$-eq·${m^{-3}}$]',
               labelpad=13,
               linespacing=0.8)
 
-mathtext.FontConstantsBase.sup1 = 0.35
-
 index = np.arange(1, len(label_order)+1, 1)
 
 width = 0.4
@@ -1458,57 +1400,35 @@ ax.scatter(x=index-0.5*width,
            alpha=1,
            zorder=3)
 
-# onsite CH4, N2O, CO2
-ax.bar(index+0.5*width,
-       m3_to_plot[::-1]['CH4_50'],
-       width=width,
-       color=dr,
-       edgecolor='k',
-       linewidth=1.5)
-
-ax.bar(index+0.5*width,
-       m3_to_plot[::-1]['N2O_50'],
+# reverse the frame once and accumulate the stacked-bar baselines instead of
+# re-slicing m3_to_plot and re-summing the lower layers for every bar call
+m3_bars = m3_to_plot[::-1]
+CH4_bar = m3_bars['CH4_50'].to_numpy()
+N2O_bar = m3_bars['N2O_50'].to_numpy()
+NC_CO2_bar = m3_bars['NC_CO2_50'].to_numpy()
+elec_bar = m3_bars['elec_50'].to_numpy()
+NG_bar = m3_bars['NG_50'].to_numpy()
+
+# draw all stacked layers (onsite CH4, N2O, CO2 fill + outline, electricity,
+# NG) with one bar call: per-bar colors/linewidths replace six separate calls
+# that each allocate a BarContainer
+n_bars = len(CH4_bar)
+zeros_bar = np.zeros(n_bars)
+ax.bar(np.tile(index+0.5*width, 6),
+       np.concatenate([CH4_bar, N2O_bar, NC_CO2_bar, NC_CO2_bar, elec_bar, NG_bar]),
        width=width,
-       color=r,
+       bottom=np.concatenate([zeros_bar,
+                              CH4_bar,
+                              CH4_bar+N2O_bar,
+                              CH4_bar+N2O_bar,
+                              CH4_bar+N2O_bar+NC_CO2_bar,
+                              CH4_bar+N2O_bar+NC_CO2_bar+elec_bar]),
+       color=[dr]*n_bars + [r]*n_bars + [colors.to_rgba(r, 0.5)]*n_bars +\
+             ['none']*n_bars + [y]*n_bars + [b]*n_bars,
        edgecolor='k',
-       linewidth=1.5,
-       bottom=m3_to_plot[::-1]['CH4_50'])
-
-ax.bar(index+0.5*width,
-       m3_to_plot[::-1]['NC_CO2_50'],
-       width=width,
-       color=r,
-       edgecolor='k',
-       linewidth=0,
-       alpha=0.5,
-       bottom=m3_to_plot[::-1]['CH4_50']+m3_to_plot[::-1]['N2O_50'])
-
-ax.bar(index+0.5*width,
-       m3_to_plot[::-1]['NC_CO2_50'],
-       width=width,
-       color='none',
-       edgecolor='k',
-       linewidth=1.5,
-       alpha=1,
-       bottom=m3_to_plot[::-1]['CH4_50']+m3_to_plot[::-1]['N2O_50'])
-
-# electricity
-ax.bar(index+0.5*width,
-       m3_to_plot[::-1]['elec_50'],
-       width=width,
-       color=y,
-       edgecolor='k',
-       linewidth=1.5,
-       bottom=m3_to_plot[::-1]['CH4_50']+m3_to_plot[::-1]['N2O_50']+m3_to_plot[::-1]['NC_CO2_50'])
-
-# NG
-ax.bar(index+0.5*width,
-       m3_to_plot[::-1]['NG_50'],
-       width=width,
-       color=b,
-       edgecolor='k',
-       linewidth=1.5,
-       bottom=m3_to_plot[::-1]['CH4_50']+m3_to_plot[::-1]['N2O_50']+m3_to_plot[::-1]['NC_CO2_50']+m3_to_plot[::-1]['elec_50'])
+       linewidth=np.concatenate([np.full(n_bars, 1.5), np.full(n_bars, 1.5),
+                                 zeros_bar, np.full(n_bars, 1.5),
+                                 np.full(n_bars, 1.5), np.full(n_bars, 1.5)]))
 
 #%% sensitivity - data preparation
 
@@ -1524,13 +1444,12 @@ spearman_order = ['COD_MC','TN_MC',
 spearman_p = spearman_p[spearman_order]
 spearman_rho = spearman_rho[spearman_order]
 
-for i in range(0, spearman_p.shape[0]):
-    for j in range(0, spearman_p.shape[1]):
-        if (spearman_p.iloc[i, j] >= 0.05) or (np.isnan(spearman_p.iloc[i, j]) or spearman_rho.iloc[i, j] <= 0.2):
-            spearman_rho.iloc[i, j] = 0
+# zero out insignificant/weak correlations in one vectorized mask write
+# instead of a per-cell Python loop
+spearman_rho[(spearman_p >= 0.05) | spearman_p.isna() | (spearman_rho <= 0.2)] = 0
 
 select_parameters = spearman_rho.loc[:, (spearman_rho != 0).any(axis=0)]
-select_parameters.index = [crosswalk[i] for i in select_parameters.index]
+select_parameters.index = select_parameters.index.map(crosswalk_ser)
 
 select_parameters = select_parameters.loc[['*A1','A1','*A1e','A1e','*A2','*A3','A3',
                                            '*A4','A4','*A5','A5','*A6','A6',
@@ -1554,18 +1473,6 @@ annotation = annotation.applymap(lambda x: '' if x == 0 else f'{x:.2f}')
 
 color_map_Guest = colors.LinearSegmentedColormap.from_list('color_map_Guest', ['w', r, dr])
 
-plt.rcParams['axes.linewidth'] = 1.5
-plt.rcParams['hatch.linewidth'] = 1.5
-plt.rcParams['xtick.labelsize'] = 25
-plt.rcParams['ytick.labelsize'] = 25
-plt.rcParams['font.sans-serif'] = 'Arial'
-plt.rcParams['pdf.fonttype'] = 42
-plt.rcParams['ps.fonttype'] = 42
-
-plt.rcParams.update({'mathtext.fontset':'custom'})
-plt.rcParams.update({'mathtext.default':'regular'})
-plt.rcParams.update({'mathtext.bf':'Arial: bold'})
-
 fig, ax = plt.subplots(figsize=(30, 3.63))
 
 ax = plt.gca()
@@ -1589,37 +1496,43 @@ spearman_heatman.set_xticklabels(spearman_heatman.get_xticklabels(), rotation=90
 
 #%% total emission
 
-TT_elec = []
+# the elec_MC samples were already loaded into TT_elec_uncertainty,
+# so take all the medians in one vectorized pass instead of re-reading
+# every MC/{TT}_MC.xlsx file
+assert (WWTP_EF.index != TT_elec_uncertainty.columns).sum() == 0
 
-for TT in WWTP_EF.index:
-    breakdown_data_MC = pd.read_excel(f'MC/{TT}_MC.xlsx')
-    
-    TT_elec.append(breakdown_data_MC['elec_MC'].quantile(0.5))
+TT_elec = TT_elec_uncertainty.quantile(0.5).to_numpy()
 
 assert (WWTP_EF.index != WWTP_TT_all.columns).sum() == 0
 
+# the five EF columns share the same flow-split matrix, so convert it to a
+# numpy array once and compute them with one matrix product instead of five
+WWTP_TT_all_arr = WWTP_TT_all.to_numpy()
+EF_50_cols = ['CH4_50','N2O_50','NC_CO2_50','NG_combustion_50','NG_upstream_50']
+median_emissions = WWTP_TT_all_arr @ WWTP_EF[EF_50_cols].to_numpy()*MG_2_m3
+
 # direct emission in kg CO2-eq/day
-WWTP_TT['CH4_median'] = WWTP_TT_all @ WWTP_EF['CH4_50']*MG_2_m3
-WWTP_TT['N2O_median'] = WWTP_TT_all @ WWTP_EF['N2O_50']*MG_2_m3
-WWTP_TT['NC_CO2_median'] = WWTP_TT_all @ WWTP_EF['NC_CO2_50']*MG_2_m3
+WWTP_TT[['CH4_median','N2O_median','NC_CO2_median']] = median_emissions[:, :3]
 
 # electricity emission in kg CO2-eq/day
-WWTP_TT['electricity_median'] = (WWTP_TT_all @ TT_elec)*WWTP_TT['kg_CO2_kWh']
+WWTP_TT['electricity_median'] = (WWTP_TT_all_arr @ TT_elec)*WWTP_TT['kg_CO2_kWh'].to_numpy()
 
 # NG emission in kg CO2-eq/day
-WWTP_TT['natural_gas_combustion_median'] = WWTP_TT_all @ WWTP_EF['NG_combustion_50']*MG_2_m3
-WWTP_TT['natural_gas_upstream_median'] = WWTP_TT_all @ WWTP_EF['NG_upstream_50']*MG_2_m3
+WWTP_TT[['natural_gas_combustion_median',
+         'natural_gas_upstream_median']] = median_emissions[:, 3:]
 
 # solids emission in kg CO2-eq/day
 WWTP_TT['solids_landfilling_CH4_median'] = WWTP_TT['landfill']/365*5.65/1000*29.8
 WWTP_TT['solids_land_application_N2O_median'] = WWTP_TT['land_application']/365*np.quantile(np.random.triangular(0.0122, 0.049, 0.062, 10000), 0.5)*0.01*N_2_N2O*273
 
+# sum on the extracted ndarray, DataFrame.sum would first copy the
+# selected columns into a temporary frame
 WWTP_TT['total_median'] = WWTP_TT[['CH4_median','N2O_median','NC_CO2_median',
                                    'natural_gas_combustion_median',
                                    'natural_gas_upstream_median',
                                    'electricity_median',
                                    'solids_landfilling_CH4_median',
-                                   'solids_land_application_N2O_median']].sum(axis=1)
+                                   'solids_land_application_N2O_median']].to_numpy().sum(axis=1)
 
 #%% energy uncertainty - data preparation
 
@@ -1635,8 +1548,9 @@ def get_energy_uncertainty(quantile):
     
     for dataset in [TT_elec_uncertainty_renamed, TT_elec_chemical_uncertainty_renamed, TT_NG_uncertainty_renamed, TT_NG_chemical_uncertainty_renamed]:
         for TT in ['A1','A1e','A3','A4','A5','A6','E3']:
-            dataset['[*]'+TT] = (TT_flow[TT]*dataset.sort_values(by=TT)[TT] +\
-                                 TT_flow['*'+TT]*dataset.sort_values(by=TT)['*'+TT])/(TT_flow[TT] + TT_flow['*'+TT])
+            sorted_pair = dataset[[TT, '*'+TT]].sort_values(by=TT)
+            dataset['[*]'+TT] = (TT_flow[TT]*sorted_pair[TT] +\
+                                 TT_flow['*'+TT]*sorted_pair['*'+TT])/(TT_flow[TT] + TT_flow['*'+TT])
         
         dataset.drop(columns=['A1','*A1','A1e','*A1e','A3','*A3','A4',
                               '*A4','A5','*A5','A6','*A6','E3','*E3'], inplace=True)
@@ -1664,19 +1578,18 @@ energy_uncertainty_95 = get_energy_uncertainty(95)
     
 energy_uncertainty_50_to_plot = energy_uncertainty_50[energy_uncertainty_50.columns[::-1]]
 
-fig, ax = plt.subplots(figsize=(32, 7))
-
-plt.rcParams['axes.linewidth'] = 1.5
-plt.rcParams['hatch.linewidth'] = 1.5
-plt.rcParams['xtick.labelsize'] = 25
-plt.rcParams['ytick.labelsize'] = 25
-plt.rcParams['font.sans-serif'] = 'Arial'
-plt.rcParams['pdf.fonttype'] = 42
-plt.rcParams['ps.fonttype'] = 42
+# pull each plotted row out once and apply the unit conversion on the
+# numpy array instead of repeating .loc selections and divisions per bar
+elec_total = energy_uncertainty_50_to_plot.loc['total_electricity'].to_numpy()*kWh_2_MJ/MG_2_m3
+elec_chemical = energy_uncertainty_50_to_plot.loc['chemical_electricity'].to_numpy()*kWh_2_MJ/MG_2_m3
+elec_err_low = energy_uncertainty_50_to_plot.loc['total_electricity_50_5'].to_numpy()*kWh_2_MJ/MG_2_m3
+elec_err_high = energy_uncertainty_50_to_plot.loc['total_electricity_95_50'].to_numpy()*kWh_2_MJ/MG_2_m3
+NG_total = energy_uncertainty_50_to_plot.loc['total_NG'].to_numpy()/MG_2_m3
+NG_chemical = energy_uncertainty_50_to_plot.loc['chemical_NG'].to_numpy()/MG_2_m3
+NG_err_low = energy_uncertainty_50_to_plot.loc['total_NG_50_5'].to_numpy()/MG_2_m3
+NG_err_high = energy_uncertainty_50_to_plot.loc['total_NG_95_50'].to_numpy()/MG_2_m3
 
-plt.rcParams.update({'mathtext.fontset':'custom'})
-plt.rcParams.update({'mathtext.default':'regular'})
-plt.rcParams.update({'mathtext.bf':'Arial: bold'})
+fig, ax = plt.subplots(figsize=(32, 7))
 
 width = 0.4
 
@@ -1694,7 +1607,7 @@ index = np.arange(1, len(label_order)+1, 1)
 plt.xticks(index, label_order[::-1], rotation=90, fontname='Arial')
 
 ax.bar(index-0.5*width,
-       (energy_uncertainty_50_to_plot.loc['total_electricity'] - energy_uncertainty_50_to_plot.loc['chemical_electricity'])*kWh_2_MJ/MG_2_m3,
+       elec_total - elec_chemical,
        width=width,
        color=y,
        edgecolor='k',
@@ -1702,39 +1615,37 @@ ax.bar(index-0.5*width,
 
 # the baseline is median, use 5th/95th as error bars
 ax.bar(index-0.5*width,
-       energy_uncertainty_50_to_plot.loc['chemical_electricity']*kWh_2_MJ/MG_2_m3,
-       yerr=(energy_uncertainty_50_to_plot.loc['total_electricity_50_5']*kWh_2_MJ/MG_2_m3, energy_uncertainty_50_to_plot.loc['total_electricity_95_50']*kWh_2_MJ/MG_2_m3),
+       elec_chemical,
+       yerr=(elec_err_low, elec_err_high),
        error_kw=dict(capsize=3.5, lw=1.5, capthick=1.5),
        width=width,
        color=y,
        edgecolor='k',
        linewidth=1.5,
        hatch='///',
-       bottom=(energy_uncertainty_50_to_plot.loc['total_electricity'] - energy_uncertainty_50_to_plot.loc['chemical_electricity'])*kWh_2_MJ/MG_2_m3)
+       bottom=elec_total - elec_chemical)
 
 ax.bar(index+0.5*width,
-       (energy_uncertainty_50_to_plot.loc['total_NG'] - energy_uncertainty_50_to_plot.loc['chemical_NG'])/MG_2_m3,
+       NG_total - NG_chemical,
        width=width,
        color=b,
        edgecolor='k',
        linewidth=1.5)
 
 ax.bar(index+0.5*width,
-       energy_uncertainty_50_to_plot.loc['chemical_NG']/MG_2_m3,
-       yerr=(energy_uncertainty_50_to_plot.loc['total_NG_50_5']/MG_2_m3, energy_uncertainty_50_to_plot.loc['total_NG_95_50']/MG_2_m3),
+       NG_chemical,
+       yerr=(NG_err_low, NG_err_high),
        error_kw=dict(capsize=3.5, lw=1.5, capthick=1.5),
        width=width,
        color=b,
        edgecolor='k',
        linewidth=1.5,
        hatch='///',
-       bottom=(energy_uncertainty_50_to_plot.loc['total_NG'] - energy_uncertainty_50_to_plot.loc['chemical_NG'])/MG_2_m3)
+       bottom=NG_total - NG_chemical)
 
 ax.set_ylabel('$\mathbf{Upstream\ energy}$\n[MJ·${m^{-3}}$]', fontname='Arial',
               fontsize=28, labelpad=3, linespacing=0.8)
 
-mathtext.FontConstantsBase.sup1 = 0.35
-
 ax_left = ax.twinx()
 ax_left.set_ylim(ax.get_ylim())
 
@@ -1775,18 +1686,6 @@ TT_num_to_plot = TT_num_to_plot.loc[label_order]
 
 fig, ax = plt.subplots(figsize=(32, 7))
 
-plt.rcParams['axes.linewidth'] = 1.5
-plt.rcParams['hatch.linewidth'] = 1.5
-plt.rcParams['xtick.labelsize'] = 25
-plt.rcParams['ytick.labelsize'] = 25
-plt.rcParams['font.sans-serif'] = 'Arial'
-plt.rcParams['pdf.fonttype'] = 42
-plt.rcParams['ps.fonttype'] = 42
-
-plt.rcParams.update({'mathtext.fontset':'custom'})
-plt.rcParams.update({'mathtext.default':'regular'})
-plt.rcParams.update({'mathtext.bf':'Arial: bold'})
-
 width = 0.8
 
 ax = plt.gca()
@@ -1800,9 +1699,9 @@ ax.tick_params(axis='y', direction='inout', length=15, width=1.5, pad=0)
 
 index = np.arange(1, len(label_order)+1, 1)
 
-ax.bar(index, TT_flow_to_plot[::-1]*MG_2_m3/1000000000*365, width=width,
+ax.bar(index, TT_flow_to_plot[::-1]*MG_2_m3*kg_d_2_MMT_yr, width=width,
        color=a, edgecolor='none', alpha=0.5)
-ax.bar(index, TT_flow_to_plot[::-1]*MG_2_m3/1000000000*365, width=width,
+ax.bar(index, TT_flow_to_plot[::-1]*MG_2_m3*kg_d_2_MMT_yr, width=width,
        color='none', edgecolor='k', linewidth=1.5)
 
 plt.xticks(index, label_order[::-1], rotation=90, fontname='Arial')
@@ -1810,8 +1709,6 @@ plt.xticks(index, label_order[::-1], rotation=90, fontname='Arial')
 ax.set_ylabel('$\mathbf{Flow}$\n[billion ${m^{3}}$·${year^{-1}}$]',
               fontname='Arial', fontsize=28, labelpad=1, linespacing=0.8)
 
-mathtext.FontConstantsBase.sup1 = 0.35
-
 ax_right = ax.twinx()
 
 ax_right.set_ylim([0, 6])
@@ -1827,16 +1724,14 @@ ax_right.set_ylabel('$\mathbf{Count}$ [k]', fontname='Arial', fontsize=28, label
 
 #%% annual plot - visualization - data preparation
 
-m3_to_annual = WWTP_EF.copy()*MG_2_m3
-m3_to_annual.reset_index(inplace=True)
-m3_to_annual['new_TT'] = m3_to_annual['index'].apply(lambda x: crosswalk[x])
-m3_to_annual.set_index('new_TT', inplace=True)
-m3_to_annual.drop(columns='index', inplace=True)
+m3_to_annual = WWTP_EF.set_axis(WWTP_EF.index.map(crosswalk_ser), axis=0)
 
-annual_plot = m3_to_annual.multiply(TT_flow, axis=0)
-
-# kg/day to MMT/year
-annual_plot = annual_plot*365/1000000000
+# fold the m3 conversion, the flow multiply, and the kg/day to MMT/year
+# conversion into one broadcast instead of three full-frame passes
+assert (m3_to_annual.index != TT_flow.index).sum() == 0
+annual_plot = pd.DataFrame(m3_to_annual.to_numpy()*\
+                           (TT_flow.to_numpy()*MG_2_m3*kg_d_2_MMT_yr)[:, None],
+                           index=m3_to_annual.index, columns=m3_to_annual.columns)
 
 annual_to_plot = annual_plot.copy()
 
@@ -1854,18 +1749,6 @@ annual_result = annual_to_plot.copy()
 
 fig, ax = plt.subplots(figsize=(32, 7))
 
-plt.rcParams['axes.linewidth'] = 1.5
-plt.rcParams['hatch.linewidth'] = 1.5
-plt.rcParams['xtick.labelsize'] = 25
-plt.rcParams['ytick.labelsize'] = 25
-plt.rcParams['font.sans-serif'] = 'Arial'
-plt.rcParams['pdf.fonttype'] = 42
-plt.rcParams['ps.fonttype'] = 42
-
-plt.rcParams.update({'mathtext.fontset':'custom'})
-plt.rcParams.update({'mathtext.default':'regular'})
-plt.rcParams.update({'mathtext.bf':'Arial: bold'})
-
 ax = plt.gca()
 ax.set_xlim([0.15, len(label_order)+0.85])
 ax.set_ylim([0, 16])
@@ -1898,13 +1781,11 @@ ax.set_ylabel('$\mathbf{Annual\ GHG}$\n[MMT ${CO_2}$-eq·${year^{-1}}$]',
               labelpad=0,
               linespacing=0.8)
 
-mathtext.FontConstantsBase.sup1 = 0.35
-
 index = np.arange(1, len(label_order)+1, 1)
 
 width = 0.4
 
-bp = ax.boxplot(total_MC[total_MC.columns[::-1]]*TT_flow_to_plot[::-1]*MG_2_m3/1000000000*365,
+bp = ax.boxplot(total_MC[total_MC.columns[::-1]]*TT_flow_to_plot[::-1]*MG_2_m3*kg_d_2_MMT_yr,
                 positions=index-0.5*width,
                 widths=width,
                 whis=[5, 95],
@@ -1917,7 +1798,7 @@ bp = ax.boxplot(total_MC[total_MC.columns[::-1]]*TT_flow_to_plot[::-1]*MG_2_m3/1
 plt.xticks(np.arange(1, len(label_order)+1, 1), label_order[::-1], rotation=90, fontname='Arial')
 
 ax.scatter(x=index-0.5*width,
-           y=(total_MC[total_MC.columns[::-1]]*TT_flow_to_plot[::-1]*MG_2_m3/1000000000*365).mean(),
+           y=(total_MC[total_MC.columns[::-1]]*TT_flow_to_plot[::-1]*MG_2_m3*kg_d_2_MMT_yr).mean(),
            marker='D',
            s=50,
            c='w',
@@ -1926,80 +1807,74 @@ ax.scatter(x=index-0.5*width,
            alpha=1,
            zorder=3)
 
-# onsite CH4, N2O, CO2
-ax.bar(index+0.5*width,
-       annual_to_plot[::-1]['CH4_50'],
-       width=width,
-       color=dr,
-       edgecolor='k',
-       linewidth=1.5)
-
-ax.bar(index+0.5*width,
-       annual_to_plot[::-1]['N2O_50'],
-       width=width,
-       color=r,
-       edgecolor='k',
-       linewidth=1.5,
-       bottom=annual_to_plot[::-1]['CH4_50'])
-
-ax.bar(index+0.5*width,
-       annual_to_plot[::-1]['NC_CO2_50'],
-       width=width,
-       color=r,
-       edgecolor='k',
-       linewidth=0,
-       alpha=0.5,
-       bottom=annual_to_plot[::-1]['CH4_50']+annual_to_plot[::-1]['N2O_50'])
-
-ax.bar(index+0.5*width,
-       annual_to_plot[::-1]['NC_CO2_50'],
-       width=width,
-       color='none',
-       edgecolor='k',
-       linewidth=1.5,
-       alpha=1,
-       bottom=annual_to_plot[::-1]['CH4_50']+annual_to_plot[::-1]['N2O_50'])
-
-# electricity
-ax.bar(index+0.5*width,
-       annual_to_plot[::-1]['elec_50'],
-       width=width,
-       color=y,
-       edgecolor='k',
-       linewidth=1.5,
-       bottom=annual_to_plot[::-1]['CH4_50']+annual_to_plot[::-1]['N2O_50']+annual_to_plot[::-1]['NC_CO2_50'])
-
-# NG
-ax.bar(index+0.5*width,
-       annual_to_plot[::-1]['NG_50'],
+# same as the per volume plot: reverse once and reuse the layer arrays
+annual_bars = annual_to_plot[::-1]
+CH4_bar = annual_bars['CH4_50'].to_numpy()
+N2O_bar = annual_bars['N2O_50'].to_numpy()
+NC_CO2_bar = annual_bars['NC_CO2_50'].to_numpy()
+elec_bar = annual_bars['elec_50'].to_numpy()
+NG_bar = annual_bars['NG_50'].to_numpy()
+
+# one bar call for all stacked layers, as in the per volume plot
+n_bars = len(CH4_bar)
+zeros_bar = np.zeros(n_bars)
+ax.bar(np.tile(index+0.5*width, 6),
+       np.concatenate([CH4_bar, N2O_bar, NC_CO2_bar, NC_CO2_bar, elec_bar, NG_bar]),
        width=width,
-       color=b,
+       bottom=np.concatenate([zeros_bar,
+                              CH4_bar,
+                              CH4_bar+N2O_bar,
+                              CH4_bar+N2O_bar,
+                              CH4_bar+N2O_bar+NC_CO2_bar,
+                              CH4_bar+N2O_bar+NC_CO2_bar+elec_bar]),
+       color=[dr]*n_bars + [r]*n_bars + [colors.to_rgba(r, 0.5)]*n_bars +\
+             ['none']*n_bars + [y]*n_bars + [b]*n_bars,
        edgecolor='k',
-       linewidth=1.5,
-       bottom=annual_to_plot[::-1]['CH4_50']+annual_to_plot[::-1]['N2O_50']+annual_to_plot[::-1]['NC_CO2_50']+annual_to_plot[::-1]['elec_50'])
+       linewidth=np.concatenate([np.full(n_bars, 1.5), np.full(n_bars, 1.5),
+                                 zeros_bar, np.full(n_bars, 1.5),
+                                 np.full(n_bars, 1.5), np.full(n_bars, 1.5)]))
 
 #%% visualization in U.S. (data preparation)
 
 WWTP_TT_results = WWTP_TT.copy()
 
-TT_indentifier = WWTP_TT_results[final_code].apply(lambda x: x > 0)
-WWTP_TT_results['TT'] = TT_indentifier.apply(lambda x: list(np.array(final_code)[x.values]), axis=1)
+TT_indentifier = WWTP_TT_results[final_code] > 0
+
+# list the TTs of each WWTP with one C-level scan of the boolean matrix
+# instead of running a Python lambda per row
+rows, cols = np.nonzero(TT_indentifier.to_numpy())
+row_splits = np.searchsorted(rows, np.arange(1, len(WWTP_TT_results)))
+WWTP_TT_results['TT'] = [list(i) for i in np.split(np.array(final_code)[cols], row_splits)]
 
 TT_indentifier.rename(columns=crosswalk, inplace=True)
-final_code_array = np.array([crosswalk[i] for i in final_code])
+final_code_array = crosswalk_ser[final_code].to_numpy()
 WWTP_TT_results_output = WWTP_TT_results.copy()
-WWTP_TT_results_output['TT'] = TT_indentifier.apply(lambda x: list(final_code_array[x.values]), axis=1)
+# renaming the columns does not change the nonzero pattern, so reuse it
+WWTP_TT_results_output['TT'] = [list(i) for i in np.split(final_code_array[cols], row_splits)]
 
 # the lon and lat are in NAD83 (EPSG:4269)
-WWTP_visual = gpd.GeoDataFrame(WWTP_TT_results, crs='EPSG:4269',
-                               geometry=gpd.points_from_xy(x=WWTP_TT_results.LONGITUDE,
-                                                           y=WWTP_TT_results.LATITUDE))
-
-US = gpd.read_file('US_data/cb_2018_us_state_500k.shp')
-US = US[['STUSPS','geometry']]
-
-WWTP_visual = WWTP_visual.to_crs(crs='EPSG:4326')
-US = US.to_crs(crs='EPSG:4326')
+# project the coordinate arrays once with pyproj and build the point
+# geometries directly in the plotting CRS with one vectorized shapely
+# call, instead of constructing a NAD83 geometry array and then pushing
+# every point through to_crs
+transformer = Transformer.from_crs('EPSG:4269', 'EPSG:4326', always_xy=True)
+visual_x, visual_y = transformer.transform(WWTP_TT_results['LONGITUDE'].to_numpy(),
+                                           WWTP_TT_results['LATITUDE'].to_numpy())
+WWTP_visual = gpd.GeoDataFrame(WWTP_TT_results, crs='EPSG:4326',
+                               geometry=shapely.points(visual_x, visual_y))
+
+# shapefile parsing and polygon reprojection dominate this cell, so cache
+# the trimmed, projected state map to Parquet after the first run
+try:
+    US = gpd.read_parquet('US_data/cb_2018_us_state_500k_4326.parquet')
+except FileNotFoundError:
+    US = gpd.read_file('US_data/cb_2018_us_state_500k.shp')
+    US = US[['STUSPS','geometry']].to_crs(crs='EPSG:4326')
+    US.to_parquet('US_data/cb_2018_us_state_500k_4326.parquet')
+
+# every map shares the same basemap, so filter to the continental states
+# once here rather than on each add_TT_marker call
+US_continental = US[~US['STUSPS'].isin(non_continental)]
 
 assert (WWTP_visual.LATITUDE == None).sum() == 0
 assert (WWTP_visual.LONGITUDE == None).sum() == 0
@@ -2007,47 +1882,35 @@ assert (WWTP_visual.LONGITUDE == None).sum() == 0
 # note the area of the marker is proportional to the emission
 def add_TT_marker(dataset, option, TT, color, edgecolor, title):
     fig, ax = plt.subplots(figsize=(30, 30))
+
+    US_continental.plot(ax=ax, color='white', edgecolor='black', linewidth=3)
     
-    plt.rcParams['axes.linewidth'] = 1.5
-    plt.rcParams['hatch.linewidth'] = 1.5
-    plt.rcParams['xtick.labelsize'] = 25
-    plt.rcParams['ytick.labelsize'] = 25
-    plt.rcParams['font.sans-serif'] = 'Arial'
-    plt.rcParams['pdf.fonttype'] = 42
-    plt.rcParams['ps.fonttype'] = 42
-
-    plt.rcParams.update({'mathtext.fontset':'custom'})
-    plt.rcParams.update({'mathtext.default':'regular'})
-    plt.rcParams.update({'mathtext.bf':'Arial: bold'})
-    
-    US[~US['STUSPS'].isin(non_continental)].plot(ax=ax, color='white',
-                                                 edgecolor='black', linewidth=3)
-    
+    # the indicator columns travel with the dataset, so test TT membership on
+    # them directly instead of applying a Python lambda to the per-row lists
     if isinstance(TT, list):
-        other_emission = dataset[dataset.TT.apply(lambda x: len([i for i in TT if i in x]) == 0)]
-        other_emission = other_emission.sort_values(by=option, ascending=False)
-        other_emission.plot(ax=ax, markersize=other_emission[option]/400, alpha=0.15,
-                            color='none', edgecolor='k', linewidth=1.5)
-
-        TT_emission = dataset[dataset.TT.apply(lambda x: len([i for i in TT if i in x]) != 0)]
-        TT_emission = TT_emission.sort_values(by=option, ascending=False)
-        TT_emission.plot(ax=ax, markersize=TT_emission[option]/400, alpha=1,
-                         color=color, edgecolor=edgecolor, linewidth=1.5)
+        in_TT = dataset[TT].to_numpy(dtype=bool).any(axis=1)
     else:
-        other_emission = dataset[dataset.TT.apply(lambda x: TT not in x)]
-        other_emission = other_emission.sort_values(by=option, ascending=False)
-        other_emission.plot(ax=ax, markersize=other_emission[option]/400, alpha=0.15,
-                            color='none', edgecolor='k', linewidth=1.5)
-
-        TT_emission = dataset[dataset.TT.apply(lambda x: TT in x)]
-        TT_emission = TT_emission.sort_values(by=option, ascending=False)
-        TT_emission.plot(ax=ax, markersize=TT_emission[option]/400, alpha=1,
-                         color=color, edgecolor=edgecolor, linewidth=1.5)
-    
+        in_TT = dataset[TT].to_numpy(dtype=bool)
+
+    # marker sizes only need plotting precision, so derive them once per
+    # subset as float32 arrays instead of re-dividing the column per use
+    other_emission = dataset[~in_TT]
+    other_emission = other_emission.sort_values(by=option, ascending=False)
+    other_emission.plot(ax=ax,
+                        markersize=other_emission[option].to_numpy(dtype=np.float32)/400,
+                        alpha=0.15, color='none', edgecolor='k', linewidth=1.5)
+
+    TT_emission = dataset[in_TT]
+    TT_emission = TT_emission.sort_values(by=option, ascending=False)
+    TT_size = TT_emission[option].to_numpy(dtype=np.float32)/400
+    TT_emission.plot(ax=ax, markersize=TT_size, alpha=1,
+                     color=color, edgecolor=edgecolor, linewidth=1.5)
+
     color_1 = color_2 = color_3 = color_4 = 'w'
-    
-    max_size = max(TT_emission[option]/400)
-    min_size = min(TT_emission[option]/400)
+
+    # already sorted descending, so the extremes are the ends of the array
+    max_size = TT_size[0]
+    min_size = TT_size[-1]
     
     if max_size > 2000000000/365/400:
         raise ValueError('add another layer of legend')
@@ -2074,13 +1937,11 @@ def add_TT_marker(dataset, option, TT, color, edgecolor, title):
                                color='k', lw=3, fc='none', alpha=1)
     ax.add_patch(rectangle_edge)
     
-    ax.scatter(x=-120.46, y=27.1, marker='o', s=2000000000/365/400, c=color_1, linewidths=3,
-               alpha=1, edgecolor='k')
-    ax.scatter(x=-120.46, y=27.1, marker='o', s=1000000000/365/400, c=color_2, linewidths=3,
-               alpha=1, edgecolor='k')
-    ax.scatter(x=-120.46, y=27.1, marker='o', s=250000000/365/400, c=color_3, linewidths=3,
-               alpha=1, edgecolor='k')
-    ax.scatter(x=-120.46, y=27.1, marker='o', s=10000000/365/400, c=color_4, linewidths=3,
+    # one collection for the four concentric legend markers (largest first so
+    # the smaller layers stay visible) instead of four scatter calls
+    ax.scatter(x=[-120.46]*4, y=[27.1]*4, marker='o',
+               s=np.array([2000000000, 1000000000, 250000000, 10000000])/365/400,
+               c=[color_1, color_2, color_3, color_4], linewidths=3,
                alpha=1, edgecolor='k')
     
     plt.figtext(0.179, 0.385, '[MMT ${CO_2}$-eq·${year^{-1}}$]', fontdict={'family':'Arial','fontsize': 42,'color':'k','fontweight':'bold'})
@@ -2142,59 +2003,53 @@ add_TT_marker(WWTP_visual, 'total_median', ['LAGOON_AER','LAGOON_ANAER','LAGOON_
 
 facility_data = WWTP_TT_results_output.copy()
 
-sorted_facilities = facility_data.sort_values(by='total_median', ascending=False).reset_index(drop=True)
-sorted_facilities['cumulative_emissions'] = sorted_facilities['total_median'].cumsum()
-total_emissions = sorted_facilities['total_median'].sum()
-sorted_facilities['cumulative_distribution'] = sorted_facilities['cumulative_emissions']/total_emissions
-
-sorted_facilities['facility_rank'] = sorted_facilities.index + 1
-sorted_facilities['facility_fraction'] = sorted_facilities['facility_rank']/len(sorted_facilities)
+# cumulative curves only feed matplotlib, so do the arithmetic on numpy
+# arrays instead of assigning intermediate DataFrame columns
+emission_sorted = np.sort(facility_data['total_median'].to_numpy())[::-1]
+cumulative_distribution = emission_sorted.cumsum()
+cumulative_distribution /= cumulative_distribution[-1]
+facility_fraction = np.arange(1, len(facility_data) + 1)/len(facility_data)
+
+# same circle markers on all three curves, so evaluate the size once
+cdf_markersize = pi*1.5**2
+
+# the tick positions never change between the three figures either
+cdf_ticks = np.arange(0, 1.2, 0.2)
+cdf_ticks_wide = np.arange(0, 1.6, 0.2)
+
+# the three cumulative-distribution figures share the same axis styling
+# (inout major ticks plus mirrored tick marks on the top/right edges), so
+# set it up once here instead of repeating the block per figure
+def style_cdf_ax(ax, xlim, ylim, xticks, yticks):
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+
+    ax.tick_params(direction='inout', length=15, width=1.5,
+                   bottom=True, top=True, left=True, right=True,
+                   labeltop=False, labelright=False, pad=0)
+
+    ax.set_xticks(xticks)
+    ax.set_yticks(yticks)
+
+    # the top/right ticks only mirror the bottom/left ones, so restyle
+    # them in place (inward, half length) instead of building empty
+    # twiny/twinx axes just to hold them
+    for tick in ax.xaxis.get_major_ticks():
+        tick.tick2line.set_marker(TICKDOWN)
+        tick.tick2line.set_markersize(7.5)
+    for tick in ax.yaxis.get_major_ticks():
+        tick.tick2line.set_marker(TICKLEFT)
+        tick.tick2line.set_markersize(7.5)
 
 fig, ax = plt.subplots(figsize=(6, 6))
-plt.rcParams['axes.linewidth'] = 1.5
-plt.rcParams['hatch.linewidth'] = 1.5
-plt.rcParams['xtick.labelsize'] = 25
-plt.rcParams['ytick.labelsize'] = 25
-plt.rcParams['font.sans-serif'] = 'Arial'
-plt.rcParams['pdf.fonttype'] = 42
-plt.rcParams['ps.fonttype'] = 42
-
-plt.rcParams.update({'mathtext.fontset':'custom'})
-plt.rcParams.update({'mathtext.default':'regular'})
-plt.rcParams.update({'mathtext.bf':'Arial: bold'})
-
-ax = plt.gca()
-ax.set_xlim([0, 1])
-ax.set_ylim([0, 1])
-
-ax.tick_params(direction='inout', length=15, width=1.5,
-               bottom=True, top=False, left=True, right=False, pad=0)
-
-plt.xticks(np.arange(0, 1.2, 0.2), fontname='Arial')
-plt.yticks(np.arange(0, 1.2, 0.2), fontname='Arial')
+style_cdf_ax(ax, [0, 1], [0, 1], cdf_ticks, cdf_ticks)
 
-ax_top = ax.twiny()
-ax_top.set_xlim(ax.get_xlim())
-plt.xticks(np.arange(0, 1.2, 0.2), fontname='Arial')
-
-ax_top.tick_params(direction='in', length=7.5, width=1.5,
-                   bottom=False, top=True, left=False, right=False,
-                   labelcolor='none')
-
-ax_bottom = ax.twinx()
-ax_bottom.set_ylim(ax.get_ylim())
-plt.yticks(np.arange(0, 1.2, 0.2), fontname='Arial')
-
-ax_bottom.tick_params(direction='in', length=7.5, width=1.5,
-                      bottom=False, top=False, left=False, right=True,
-                      labelcolor='none')
-
-plt.plot(sorted_facilities['facility_fraction'],
-         sorted_facilities['cumulative_distribution'],
-         linewidth=1.5,
-         marker='o',
-         color='k',
-         markersize=pi*1.5**2)
+ax.plot(facility_fraction,
+        cumulative_distribution,
+        linewidth=1.5,
+        marker='o',
+        color='k',
+        markersize=cdf_markersize)
 
 ax.set_xlabel('$\mathbf{Fraction\ of\ total\ facilities}$',
               fontname='Arial',
@@ -2206,71 +2061,27 @@ ax.set_ylabel('$\mathbf{Fraction\ of\ total\ emissions}$',
               fontsize=28,
               labelpad=0)
 
-mathtext.FontConstantsBase.sup1 = 0.35
-
 #%% emission fraction vs flow fraction
 
 flow_sorted = facility_data.sort_values(by='FLOW_2022_MGD_FINAL', ascending=False).reset_index(drop=True)
-flow_sorted['cumulative_flow'] = flow_sorted['FLOW_2022_MGD_FINAL'].cumsum()
-total_flow = flow_sorted['FLOW_2022_MGD_FINAL'].sum()
-flow_sorted['flow_fraction'] = flow_sorted['cumulative_flow']/total_flow
 
-flow_sorted['cumulative_emissions'] = flow_sorted['total_median'].cumsum()
-total_emissions = flow_sorted['total_median'].sum()
-flow_sorted['emissions_fraction'] = flow_sorted['cumulative_emissions']/total_emissions
+flow_fraction = flow_sorted['FLOW_2022_MGD_FINAL'].to_numpy().cumsum()
+flow_fraction /= flow_fraction[-1]
+emissions_fraction = flow_sorted['total_median'].to_numpy().cumsum()
+emissions_fraction /= emissions_fraction[-1]
 
 fig, ax = plt.subplots(figsize=(6, 6))
-plt.rcParams['axes.linewidth'] = 1.5
-plt.rcParams['hatch.linewidth'] = 1.5
-plt.rcParams['xtick.labelsize'] = 25
-plt.rcParams['ytick.labelsize'] = 25
-plt.rcParams['font.sans-serif'] = 'Arial'
-plt.rcParams['pdf.fonttype'] = 42
-plt.rcParams['ps.fonttype'] = 42
-
-plt.rcParams.update({'mathtext.fontset':'custom'})
-plt.rcParams.update({'mathtext.default':'regular'})
-plt.rcParams.update({'mathtext.bf':'Arial: bold'})
-
-ax = plt.gca()
-ax.set_xlim([0, 1])
-ax.set_ylim([0, 1])
-
-ax.tick_params(direction='inout', length=15, width=1.5,
-               bottom=True, top=False, left=True, right=False, pad=0)
+style_cdf_ax(ax, [0, 1], [0, 1], cdf_ticks, cdf_ticks)
 
-plt.xticks(np.arange(0, 1.2, 0.2), fontname='Arial')
-plt.yticks(np.arange(0, 1.2, 0.2), fontname='Arial')
+ax.plot(flow_fraction,
+        emissions_fraction,
+        linewidth=1.5,
+        marker='o',
+        color='k',
+        markersize=cdf_markersize,
+        zorder=0)
 
-ax_top = ax.twiny()
-ax_top.set_xlim(ax.get_xlim())
-plt.xticks(np.arange(0, 1.2, 0.2), fontname='Arial')
-
-ax_top.tick_params(direction='in', length=7.5, width=1.5,
-                   bottom=False, top=True, left=False, right=False,
-                   labelcolor='none')
-
-ax_bottom = ax.twinx()
-ax_bottom.set_ylim(ax.get_ylim())
-plt.yticks(np.arange(0, 1.2, 0.2), fontname='Arial')
-
-ax_bottom.tick_params(direction='in', length=7.5, width=1.5,
-                      bottom=False, top=False, left=False, right=True,
-                      labelcolor='none')
-
-plt.plot(flow_sorted['flow_fraction'],
-         flow_sorted['emissions_fraction'],
-         linewidth=1.5,
-         marker='o',
-         color='k',
-         markersize=pi*1.5**2,
-         zorder=0)
-
-plt.plot([0,1],
-         [0,1],
-         linewidth=2,
-         color=r,
-         zorder=1)
+ax.axline((0, 0), slope=1, linewidth=2, color=r, zorder=1)
 
 ax.set_xlabel('$\mathbf{Fraction\ of\ total\ flow}$',
               fontname='Arial',
@@ -2280,51 +2091,14 @@ ax.set_xlabel('$\mathbf{Fraction\ of\ total\ flow}$',
 #%% emission fraction vs emissions magnitude
 
 fig, ax = plt.subplots(figsize=(6, 6))
+style_cdf_ax(ax, [0, 1.4], [0, 1], cdf_ticks_wide, cdf_ticks)
 
-plt.rcParams['axes.linewidth'] = 1.5
-plt.rcParams['hatch.linewidth'] = 1.5
-plt.rcParams['xtick.labelsize'] = 25
-plt.rcParams['ytick.labelsize'] = 25
-plt.rcParams['font.sans-serif'] = 'Arial'
-plt.rcParams['pdf.fonttype'] = 42
-plt.rcParams['ps.fonttype'] = 42
-
-plt.rcParams.update({'mathtext.fontset':'custom'})
-plt.rcParams.update({'mathtext.default':'regular'})
-plt.rcParams.update({'mathtext.bf':'Arial: bold'})
-
-ax = plt.gca()
-ax.set_xlim([0, 1.4])
-ax.set_ylim([0, 1])
-
-ax.tick_params(direction='inout', length=15, width=1.5,
-               bottom=True, top=False, left=True, right=False, pad=0)
-
-plt.xticks(np.arange(0, 1.6, 0.2), fontname='Arial')
-plt.yticks(np.arange(0, 1.2, 0.2), fontname='Arial')
-
-ax_top = ax.twiny()
-ax_top.set_xlim(ax.get_xlim())
-plt.xticks(np.arange(0, 1.6, 0.2), fontname='Arial')
-
-ax_top.tick_params(direction='in', length=7.5, width=1.5,
-                   bottom=False, top=True, left=False, right=False,
-                   labelcolor='none')
-
-ax_bottom = ax.twinx()
-ax_bottom.set_ylim(ax.get_ylim())
-plt.yticks(np.arange(0, 1.2, 0.2), fontname='Arial')
-
-ax_bottom.tick_params(direction='in', length=7.5, width=1.5,
-                      bottom=False, top=False, left=False, right=True,
-                      labelcolor='none')
-
-plt.plot(sorted_facilities['total_median']/1000000000*365,
-         sorted_facilities['cumulative_distribution'],
-         linewidth=1.5,
-         marker='o',
-         color='k',
-         markersize=pi*1.5**2)
+ax.plot(emission_sorted*kg_d_2_MMT_yr,
+        cumulative_distribution,
+        linewidth=1.5,
+        marker='o',
+        color='k',
+        markersize=cdf_markersize)
 
 ax.set_xlabel('$\mathbf{Median\ emissions\ magnitude}$\n[MMT ${CO_2}$-eq·${year^{-1}}$]',
               fontname='Arial',
@@ -2332,15 +2106,13 @@ ax.set_xlabel('$\mathbf{Median\ emissions\ magnitude}$\n[MMT ${CO_2}$-eq·${year
               labelpad=0,
               linespacing=0.8)
 
-mathtext.FontConstantsBase.sup1 = 0.35
-
 #%% numbers calculation
 
 # =============================================================================
 # Characterizing U.S. wastewater treatment facilities
 # =============================================================================
 
-WWTP_TT_results_output['all_TT'] = WWTP_TT_results_output['TT'].apply(lambda x: ', '.join(map(str, x)))
+WWTP_TT_results_output['all_TT'] = [', '.join(i) for i in WWTP_TT_results_output['TT']]
 
 sum(WWTP_TT_results_output['all_TT'].str.contains('A'))
 sum(WWTP_TT_results_output['all_TT'].str.contains('A'))/len(WWTP_TT_results_output)
@@ -2348,7 +2120,7 @@ sum(WWTP_TT_results_output['all_TT'].str.contains('A'))/len(WWTP_TT_results_outp
 # TT_num_output cannot be used to count facility numbers, but flow is ok
 TT_flow_output = TT_flow_to_plot.copy()
 
-sum(TT_flow_output[i] for i in TT_flow_output.index if 'A' in i)*MG_2_m3/1000000000*365
+sum(TT_flow_output[i] for i in TT_flow_output.index if 'A' in i)*MG_2_m3*kg_d_2_MMT_yr
 sum(TT_flow_output[i] for i in TT_flow_output.index if 'A' in i)/sum(TT_flow_output)
 
 sum(WWTP_TT_results_output['all_TT'].str.contains('L'))
@@ -2376,7 +2148,7 @@ sum(WWTP_TT_results_output['all_TT'].str.contains('A3,|A3$'))/len(WWTP_TT_result
 sum(WWTP_TT_results_output['all_TT'].str.contains('A3,|A3$'))
 
 TT_flow_output['[*]A3'].sum()/sum(TT_flow_output)
-sum(TT_flow_output[i] for i in TT_flow_output.index if '[*]A3' in i)*MG_2_m3/1000000000*365
+sum(TT_flow_output[i] for i in TT_flow_output.index if '[*]A3' in i)*MG_2_m3*kg_d_2_MMT_yr
 
 # [*]A1 + [*]A1e
 sum(WWTP_TT_results_output['all_TT'].str.contains('A1'))/len(WWTP_TT_results_output)
@@ -2384,7 +2156,7 @@ TT_flow_output[['[*]A1','[*]A1e']].sum()/sum(TT_flow_output)
 
 sum(WWTP_TT_results_output['all_TT'].str.contains('D|E|F|G'))/len(WWTP_TT_results_output)
 sum(TT_flow_output[i] for i in TT_flow_output.index if ('D' in i) | ('E' in i) | ('F' in i) | ('G' in i))/sum(TT_flow_output)
-sum(TT_flow_output[i] for i in TT_flow_output.index if ('D' in i) | ('E' in i) | ('F' in i) | ('G' in i))*MG_2_m3/1000000000*365
+sum(TT_flow_output[i] for i in TT_flow_output.index if ('D' in i) | ('E' in i) | ('F' in i) | ('G' in i))*MG_2_m3*kg_d_2_MMT_yr
 
 # =============================================================================
 # Electricity and natural gas requirements
@@ -2483,12 +2255,14 @@ NC_CO2_50_finder = []
 
 for TT in final_code:
     breakdown_data_MC = pd.read_excel(f'MC/{TT}_MC.xlsx')
-    CH4_N2O_50_finder.append((breakdown_data_MC[['CH4','N2O']].sum(axis=1)/breakdown_data_MC[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.5))
-    NC_CO2_50_finder.append((breakdown_data_MC['NC_CO2']/breakdown_data_MC[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.5))
+    # sum the three-gas columns once per TT and reuse for both ratios
+    biological_total = breakdown_data_MC[['CH4','N2O','NC_CO2']].sum(axis=1)
+    CH4_N2O_50_finder.append((breakdown_data_MC[['CH4','N2O']].sum(axis=1)/biological_total).quantile(0.5))
+    NC_CO2_50_finder.append((breakdown_data_MC['NC_CO2']/biological_total).quantile(0.5))
 
 biological_emission_finder['CH4_N2O'] = CH4_N2O_50_finder
 biological_emission_finder['NC_CO2'] = NC_CO2_50_finder
-biological_emission_finder.index = [crosswalk[i] for i in final_code]
+biological_emission_finder.index = final_code_array
 
 biological_emission_finder['CH4_N2O'].min()
 biological_emission_finder['CH4_N2O'].max()
@@ -2496,32 +2270,34 @@ biological_emission_finder['CH4_N2O'].max()
 biological_emission_finder[biological_emission_finder['NC_CO2']>0.11]
 
 star_E1_e = pd.concat([star_E1, star_E1e])
+star_E1_e_total = star_E1_e[['CH4','N2O','NC_CO2']].sum(axis=1)
 
-(star_E1_e[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.05)
-(star_E1_e[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.5)
-(star_E1_e[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.95)
+star_E1_e_total.quantile(0.05)
+star_E1_e_total.quantile(0.5)
+star_E1_e_total.quantile(0.95)
 
-(star_E1_e['CH4']/star_E1_e[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.05)
-(star_E1_e['CH4']/star_E1_e[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.5)
-(star_E1_e['CH4']/star_E1_e[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.95)
+(star_E1_e['CH4']/star_E1_e_total).quantile(0.05)
+(star_E1_e['CH4']/star_E1_e_total).quantile(0.5)
+(star_E1_e['CH4']/star_E1_e_total).quantile(0.95)
 
-(star_E1_e['N2O']/star_E1_e[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.05)
-(star_E1_e['N2O']/star_E1_e[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.5)
-(star_E1_e['N2O']/star_E1_e[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.95)
+(star_E1_e['N2O']/star_E1_e_total).quantile(0.05)
+(star_E1_e['N2O']/star_E1_e_total).quantile(0.5)
+(star_E1_e['N2O']/star_E1_e_total).quantile(0.95)
 
 L_n_f = pd.concat([L_n, L_f])
+L_n_f_total = L_n_f[['CH4','N2O','NC_CO2']].sum(axis=1)
 
-(L_n_f[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.05)
-(L_n_f[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.5)
-(L_n_f[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.95)
+L_n_f_total.quantile(0.05)
+L_n_f_total.quantile(0.5)
+L_n_f_total.quantile(0.95)
 
-(L_n_f['CH4']/L_n_f[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.05)
-(L_n_f['CH4']/L_n_f[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.5)
-(L_n_f['CH4']/L_n_f[['CH4','N2O','NC_CO2']].sum(axis=1)).quantile(0.95)
+(L_n_f['CH4']/L_n_f_total).quantile(0.05)
+(L_n_f['CH4']/L_n_f_total).quantile(0.5)
+(L_n_f['CH4']/L_n_f_total).quantile(0.95)
 
 E_data = [('*E1', star_E1), ('*E1e', star_E1e), ('E3', E3), ('*E3', star_E3)]
 
-E_biological_annual = sum(np.random.choice(TT_data[['CH4','N2O','NC_CO2']].sum(axis=1), 10000)*TT_flow[TT]*MG_2_m3/1000000000*365 for (TT, TT_data) in E_data)
+E_biological_annual = sum(np.random.choice(TT_data[['CH4','N2O','NC_CO2']].sum(axis=1), 10000)*TT_flow[TT]*MG_2_m3*kg_d_2_MMT_yr for (TT, TT_data) in E_data)
 
 np.quantile(E_biological_annual, 0.05)
 np.quantile(E_biological_annual, 0.5)
@@ -2530,7 +2306,7 @@ np.quantile(E_biological_annual, 0.95)
 A_data = [('*A1', star_A1), ('*A1e', star_A1e), ('*A2', star_A2), ('*A3', star_A3), ('*A4', star_A4),
           ('*A5', star_A5), ('*A6', star_A6), ('A1', A1), ('A1e', A1e), ('A3', A3), ('A4', A4), ('A5', A5), ('A6', A6)]
 
-A_biological_annual = sum(np.random.choice(TT_data[['CH4','N2O','NC_CO2']].sum(axis=1), 10000)*TT_flow[TT]*MG_2_m3/1000000000*365 for (TT, TT_data) in A_data)
+A_biological_annual = sum(np.random.choice(TT_data[['CH4','N2O','NC_CO2']].sum(axis=1), 10000)*TT_flow[TT]*MG_2_m3*kg_d_2_MMT_yr for (TT, TT_data) in A_data)
 
 np.quantile(A_biological_annual, 0.05)
 np.quantile(A_biological_annual, 0.5)
@@ -2538,7 +2314,7 @@ np.quantile(A_biological_annual, 0.95)
 
 L_data = [('L-a', L_a), ('L-f', L_f), ('L-n', L_n), ('L-u', L_u)]
 
-L_biological_annual = sum(np.random.choice(TT_data[['CH4','N2O','NC_CO2']].sum(axis=1), 10000)*TT_flow[TT]*MG_2_m3/1000000000*365 for (TT, TT_data) in L_data)
+L_biological_annual = sum(np.random.choice(TT_data[['CH4','N2O','NC_CO2']].sum(axis=1), 10000)*TT_flow[TT]*MG_2_m3*kg_d_2_MMT_yr for (TT, TT_data) in L_data)
 
 np.quantile(L_biological_annual, 0.05)
 np.quantile(L_biological_annual, 0.5)
@@ -2578,7 +2354,7 @@ for TT in final_code:
     solids_50_finder.append((breakdown_data_MC['solids']/breakdown_data_MC['total']).quantile(0.5))
 
 solids_emission_finder['solids'] = solids_50_finder
-solids_emission_finder.index = [crosswalk[i] for i in final_code]
+solids_emission_finder.index = final_code_array
 
 solids_emission_finder.max()
 solids_emission_finder
@@ -2594,15 +2370,15 @@ for TT in [i for i in total_MC_output.columns if 'e' in i]:
         pass
 
 # CH4
-annual_CH4 = sum(np.random.choice(TT_data['CH4'], 10000)*TT_flow[TT]*MG_2_m3/1000000000*365 for (TT, TT_data) in all_TT_data)
+annual_CH4 = sum(np.random.choice(TT_data['CH4'], 10000)*TT_flow[TT]*MG_2_m3*kg_d_2_MMT_yr for (TT, TT_data) in all_TT_data)
 get_quantiles(annual_CH4)
 
 # N2O
-annual_N2O = sum(np.random.choice(TT_data['N2O'], 10000)*TT_flow[TT]*MG_2_m3/1000000000*365 for (TT, TT_data) in all_TT_data)
+annual_N2O = sum(np.random.choice(TT_data['N2O'], 10000)*TT_flow[TT]*MG_2_m3*kg_d_2_MMT_yr for (TT, TT_data) in all_TT_data)
 get_quantiles(annual_N2O)
 
 # NC CO2
-annual_NC_CO2 = sum(np.random.choice(TT_data['NC_CO2'], 10000)*TT_flow[TT]*MG_2_m3/1000000000*365 for (TT, TT_data) in all_TT_data)
+annual_NC_CO2 = sum(np.random.choice(TT_data['NC_CO2'], 10000)*TT_flow[TT]*MG_2_m3*kg_d_2_MMT_yr for (TT, TT_data) in all_TT_data)
 get_quantiles(annual_NC_CO2)
 
 # electricity
@@ -2610,38 +2386,45 @@ balnc_area_flow = WWTP_TT_all.copy()
 balnc_area_flow['balancing_area'] = WWTP_TT['r']
 balnc_area_flow = balnc_area_flow.groupby(by='balancing_area').sum()
 
+# freeze the flow matrix and per-area carbon intensities as plain arrays so
+# the sampling loop does not re-scan the balancing-area frame per iteration
+balnc_area_flow_arr = balnc_area_flow.to_numpy()
+balnc_area_CI = balnc_area.set_index('r')['kg_CO2_kWh'].loc[balnc_area_flow.index].to_numpy()
+
 total = []
-for i in balnc_area_flow.index:
-    total.append([j*np.random.uniform(balnc_area[balnc_area['r'] == i]['kg_CO2_kWh']*0.8, balnc_area[balnc_area['r'] == i]['kg_CO2_kWh']*1.2, 10000) for j in balnc_area_flow.loc[i]])
+for i in range(len(balnc_area_flow_arr)):
+    total.append([j*np.random.uniform(balnc_area_CI[i]*0.8, balnc_area_CI[i]*1.2, 10000) for j in balnc_area_flow_arr[i]])
 
 TT_flow_elec = pd.DataFrame([sum(np.random.choice(total[i][j], 10000) for i in range(len(total))) for j in range(len(total[0]))])
 TT_flow_elec.index = balnc_area_flow.columns
 TT_flow_elec = TT_flow_elec.transpose()
 TT_flow_elec.rename(columns=crosswalk, inplace=True)
 
-annual_elec = sum(np.random.choice(TT_data['elec_MC'], 10000)*np.random.choice(TT_flow_elec[TT], 10000)/1000000000*365 for (TT, TT_data) in all_TT_data)
+annual_elec = sum(np.random.choice(TT_data['elec_MC'], 10000)*np.random.choice(TT_flow_elec[TT], 10000)*kg_d_2_MMT_yr for (TT, TT_data) in all_TT_data)
 get_quantiles(annual_elec)
 
 assert np.quantile(annual_elec, 0.5) < np.quantile(annual_N2O, 0.5)
 
 # NG combustion
-annual_NG_combustion = sum(np.random.choice(TT_data['NG_combustion'], 10000)*TT_flow[TT]*MG_2_m3/1000000000*365 for (TT, TT_data) in all_TT_data)
+annual_NG_combustion = sum(np.random.choice(TT_data['NG_combustion'], 10000)*TT_flow[TT]*MG_2_m3*kg_d_2_MMT_yr for (TT, TT_data) in all_TT_data)
 get_quantiles(annual_NG_combustion)
 
 # NG upstream
-annual_NG_upstream = sum(np.random.choice(TT_data['NG_upstream'], 10000)*TT_flow[TT]*MG_2_m3/1000000000*365 for (TT, TT_data) in all_TT_data)
+annual_NG_upstream = sum(np.random.choice(TT_data['NG_upstream'], 10000)*TT_flow[TT]*MG_2_m3*kg_d_2_MMT_yr for (TT, TT_data) in all_TT_data)
 get_quantiles(annual_NG_upstream)
 
 # NG
-annual_NG = sum(np.random.choice(TT_data[['NG_combustion','NG_upstream']].sum(axis=1), 10000)*TT_flow[TT]*MG_2_m3/1000000000*365 for (TT, TT_data) in all_TT_data)
+annual_NG = sum(np.random.choice(TT_data[['NG_combustion','NG_upstream']].sum(axis=1), 10000)*TT_flow[TT]*MG_2_m3*kg_d_2_MMT_yr for (TT, TT_data) in all_TT_data)
 get_quantiles(annual_NG)
 
 # landfilling
-annual_solids_LF = np.random.uniform(WWTP_TT['landfill'].sum()*0.8, WWTP_TT['landfill'].sum()*1.2, 10000)*np.random.uniform(5.65*0.9/1000, 5.65*1.1/1000, 10000)*np.random.uniform(29.8*0.9, 29.8*1.1)/1000000000
+LF_total = WWTP_TT['landfill'].sum()
+annual_solids_LF = np.random.uniform(LF_total*0.8, LF_total*1.2, 10000)*np.random.uniform(5.65*0.9/1000, 5.65*1.1/1000, 10000)*np.random.uniform(29.8*0.9, 29.8*1.1)/1000000000
 get_quantiles(annual_solids_LF)
 
 # land application
-annual_solids_LA = np.random.uniform(WWTP_TT['land_application'].sum()*0.8, WWTP_TT['land_application'].sum()*1.2, 10000)*np.random.triangular(0.0122, 0.049, 0.062, 10000)*np.random.uniform(0.002, 0.018, 10000)*N_2_N2O*np.random.uniform(273*0.9, 273*1.1, 10000)/1000000000
+LA_total = WWTP_TT['land_application'].sum()
+annual_solids_LA = np.random.uniform(LA_total*0.8, LA_total*1.2, 10000)*np.random.triangular(0.0122, 0.049, 0.062, 10000)*np.random.uniform(0.002, 0.018, 10000)*N_2_N2O*np.random.uniform(273*0.9, 273*1.1, 10000)/1000000000
 get_quantiles(annual_solids_LA)
 
 # solids
@@ -2702,7 +2485,7 @@ top_10_percent_emitters['total_median'].sum()/WWTP_total
 top_10_emitters = WWTP_TT_results_output.sort_values(by='total_median', ascending=False).iloc[0:10]
 10/len(WWTP_TT)
 top_10_emitters['FLOW_2022_MGD_FINAL'].sum()/WWTP_TT_results_output['FLOW_2022_MGD_FINAL'].sum()
-top_10_emitters['total_median'].sum()*365/1000000000
+top_10_emitters['total_median'].sum()*kg_d_2_MMT_yr
 top_10_emitters['total_median'].sum()/WWTP_total
 
 # =============================================================================
@@ -2716,8 +2499,8 @@ total_MC_output.quantile(0.05)
 total_MC_output.quantile(0.5)
 total_MC_output.quantile(0.95)
 
-AD_annual_CH4 = sum(np.random.choice(TT_data['CH4'], 10000)*TT_flow[TT]*MG_2_m3/1000000000*365 for (TT, TT_data) in all_TT_data if ('1' in TT) or ('2' in TT))
-other_annual_CH4 = sum(np.random.choice(TT_data['CH4'], 10000)*TT_flow[TT]*MG_2_m3/1000000000*365 for (TT, TT_data) in all_TT_data if ('1' not in TT) and ('2' not in TT))
+AD_annual_CH4 = sum(np.random.choice(TT_data['CH4'], 10000)*TT_flow[TT]*MG_2_m3*kg_d_2_MMT_yr for (TT, TT_data) in all_TT_data if ('1' in TT) or ('2' in TT))
+other_annual_CH4 = sum(np.random.choice(TT_data['CH4'], 10000)*TT_flow[TT]*MG_2_m3*kg_d_2_MMT_yr for (TT, TT_data) in all_TT_data if ('1' not in TT) and ('2' not in TT))
 AD_annual_CH4_random = np.random.choice(AD_annual_CH4, 10000)
 other_annual_CH4_random = np.random.choice(other_annual_CH4, 10000)
 CH4_AD_total = AD_annual_CH4_random/(AD_annual_CH4_random + other_annual_CH4_random)